@@ -1,11 +1,35 @@
-from datetime import date, datetime
+import re
+from dataclasses import fields
+from datetime import date, datetime, time
+from functools import cached_property
+from operator import attrgetter
 from typing import Optional, List, Tuple
 from pathlib import Path
+import numpy as np
 import pandas as pd # type: ignore
+import pyarrow as pa
+from sqlmodel import Session, SQLModel, delete, insert, select
 
+from core.db import CommitDB, ContributorDB, DailyStatsDB, ProjectDB, create_tables, get_engine
 from models import Category, ClosedTask
 from utils import load_closed_tasks, load_git_logs
 
+AUTHOR_RE = re.compile(r'^Author:\s*(.*?)\s*<(.*?)>', re.M)
+# Commit message: the indented and blank lines after the header of a `git log -p` block
+MESSAGE_RE = re.compile(r'\n\n((?:(?:    [^\n]*)?\n)*)')
+MESSAGE_INDENT_RE = re.compile(r'^    ', re.M)
+# Integer code of each category value, the order of the task frame categorical
+CATEGORY_CODES = {c.value: i for i, c in enumerate(Category)}
+# Commit ids per query when reading commit texts, under SQLite's bound parameter limit
+TEXT_QUERY_SIZE = 10000
+# SQLite user_version of the store, bumped when what it keeps changes: 2 keeps author-local days
+STORE_VERSION = 2
+
+
+def _commit_message(text: str) -> str:
+    """Full commit message of a `git log -p` block, without git's indentation"""
+    match = MESSAGE_RE.search(text)
+    return MESSAGE_INDENT_RE.sub("", match.group(1)).strip() if match else ""
 
 
 class PMContext:
@@ -13,46 +37,244 @@ class PMContext:
 
     def __init__(self, data_dir: str = "../data", project_title="nodis_project"):
         self.data_dir = Path(data_dir) / project_title
+        self.project_title = project_title
         print(self.data_dir)
         self.data_dir.mkdir(exist_ok=True)
 
+        # Parsed git logs and daily stats are kept in SQLite until git.logs changes
+        self.engine = get_engine(self.data_dir / "pm.db")
+        # The store only caches git.logs: one written by an older version is rebuilt, not migrated
+        with self.engine.connect() as connection:
+            version = connection.exec_driver_sql("PRAGMA user_version").scalar()
+            if version != STORE_VERSION:
+                SQLModel.metadata.drop_all(connection)
+                connection.exec_driver_sql(f"PRAGMA user_version = {STORE_VERSION}")
+                connection.commit()
+        create_tables(self.engine)
+
         # Load and validate data
         print("Loading project data...")
-        self.closed_tasks = load_closed_tasks(self.data_dir / "closed_tasks")
-        self.git_logs = load_git_logs(str(self.data_dir / "git.logs"))
+        tasks_dir = self.data_dir / "closed_tasks"
+        self.closed_tasks_df = self._build_tasks_frame(load_closed_tasks(tasks_dir) if tasks_dir.is_dir() else [])
+        self.git_logs = self._load_git_logs()
 
         # Preprocess data
         self._preprocess_data()
 
-        print(f"Loaded {len(self.closed_tasks)} tasks and {len(self.git_logs)} commits")
+        print(f"Loaded {len(self.closed_tasks_df)} tasks and {len(self.git_logs)} commits")
+
+    @staticmethod
+    def _build_tasks_frame(tasks: List[ClosedTask]) -> pd.DataFrame:
+        """Store closed tasks column-wise, one row per task"""
+        columns = [f.name for f in fields(ClosedTask)]
+        tasks_df = pd.DataFrame.from_records(
+            list(map(attrgetter(*columns), tasks)),
+            columns=columns
+        )
+        tasks_df["text"] = tasks_df["text"].astype("string")
+        tasks_df["category"] = pd.Categorical(
+            [c.value for c in tasks_df["category"]],
+            categories=list(CATEGORY_CODES)
+        )
+        tasks_df["min_skill_level"] = tasks_df["min_skill_level"].astype(object)
+        for column in ("estimated_time", "planned_at", "started_at", "finished_at", "lines_added", "lines_removed"):
+            tasks_df[column] = tasks_df[column].astype("Int64")
+        return tasks_df
+
+    @staticmethod
+    def _tasks_from_frame(tasks_df: pd.DataFrame) -> List[ClosedTask]:
+        """Build ClosedTask objects back from task rows"""
+        records = tasks_df.astype(object).where(tasks_df.notna(), None).to_dict("records")
+        return [ClosedTask.from_raw(**record) for record in records]
+
+    @property
+    def closed_tasks(self) -> List[ClosedTask]:
+        """Closed tasks as objects, built on access; internal filters use closed_tasks_df"""
+        return self._tasks_from_frame(self.closed_tasks_df)
+
+    def _get_project(self, session: Session) -> Optional[ProjectDB]:
+        return session.exec(select(ProjectDB).where(ProjectDB.name == self.project_title)).first()
+
+    def _load_git_logs(self) -> pd.DataFrame:
+        """Read commits from the project db, re-parsing git.logs only when its mtime changed"""
+        logs_path = self.data_dir / "git.logs"
+        marker = datetime.fromtimestamp(logs_path.stat().st_mtime)
+        with Session(self.engine) as session:
+            project = self._get_project(session)
+            self._store_fresh = project is not None and project.git_logs_mtime == marker
+            if self._store_fresh:
+                return self._read_commits(session, project.id) # type: ignore
+
+        self._store_commits(load_git_logs(str(logs_path)), marker)
+        # Read back so a fresh parse and a cached load give the same frame
+        with Session(self.engine) as session:
+            return self._read_commits(session, self._get_project(session).id) # type: ignore
+
+    def _store_commits(self, git_logs: pd.DataFrame, marker: datetime):
+        """Replace the stored commits of the project with freshly parsed git logs"""
+        # Blocks without a commit header, like the single empty block of an empty git.logs
+        git_logs = git_logs[git_logs["title"].notna()]
+        with Session(self.engine) as session:
+            project = self._get_project(session)
+            if project is None:
+                project = ProjectDB(name=self.project_title, repo_path=str(self.data_dir), data_path=str(self.data_dir))
+                session.add(project)
+                session.flush()
+            session.exec(delete(CommitDB).where(CommitDB.project_id == project.id)) # type: ignore
+            session.exec(delete(DailyStatsDB).where(DailyStatsDB.project_id == project.id)) # type: ignore
+
+            # Author dates are stored in UTC; days stay the author's local date, as project_manager counts them
+            dates = git_logs.index.tz_convert("UTC").tz_localize(None) if getattr(git_logs.index, "tz", None) else git_logs.index
+            days = git_logs["day"]
+            authors = [AUTHOR_RE.search(text) for text in git_logs["text"]]
+            contributors = {}
+            for match, author_date in zip(authors, dates):
+                key = match.groups() if match else ("", "")
+                seen = contributors.setdefault(key, [author_date, author_date])
+                if pd.notna(author_date):
+                    seen[0] = author_date if pd.isna(seen[0]) else min(seen[0], author_date)
+                    seen[1] = author_date if pd.isna(seen[1]) else max(seen[1], author_date)
+            contributor_ids = {}
+            for (name, email), (first_seen, last_seen) in contributors.items():
+                # Authors without a dated commit are seen when git.logs was written
+                first_seen = first_seen.to_pydatetime() if pd.notna(first_seen) else marker
+                last_seen = last_seen.to_pydatetime() if pd.notna(last_seen) else marker
+                contributor = session.exec(
+                    select(ContributorDB).where(ContributorDB.name == name, ContributorDB.email == email)
+                ).first()
+                if contributor is None:
+                    contributor = ContributorDB(name=name, email=email, first_seen=first_seen, last_seen=last_seen)
+                else:
+                    contributor.first_seen = min(contributor.first_seen, first_seen)
+                    contributor.last_seen = max(contributor.last_seen, last_seen)
+                session.add(contributor)
+                session.flush()
+                contributor_ids[(name, email)] = contributor.id
+
+            rows = [
+                {
+                    "project_id": project.id,
+                    "contributor_id": contributor_ids[match.groups() if match else ("", "")],
+                    "hash": text.split("\n", 1)[0].removeprefix("commit ").strip(),
+                    "author_date": author_date.to_pydatetime() if pd.notna(author_date) else None,
+                    "message": _commit_message(text),
+                    "title": title,
+                    "text": text,
+                    "insertions": insertions,
+                    "deletions": deletions,
+                    "is_merge": "\nMerge:" in text[:100],
+                    "day": datetime.combine(day, time()) if pd.notna(day) else None,
+                }
+                for text, title, insertions, deletions, day, author_date, match in zip(
+                    git_logs["text"], git_logs["title"], git_logs["insertions"], git_logs["deletions"],
+                    days, dates, authors
+                )
+            ]
+            if rows:
+                session.execute(insert(CommitDB), rows)
+            project.git_logs_mtime = marker
+            session.add(project)
+            session.commit()
+
+    def _read_commits(self, session: Session, project_id: int) -> pd.DataFrame:
+        """
+        Rebuild the git_logs frame, in git log order, from stored commits. Commit texts hold the
+        diffs, the bulk of the db: they stay there until get_logs selects the commits.
+        """
+        rows = session.exec(
+            select(CommitDB.id, ContributorDB.name, CommitDB.author_date, CommitDB.title,
+                   CommitDB.insertions, CommitDB.deletions, CommitDB.day)
+            .join(ContributorDB, CommitDB.contributor_id == ContributorDB.id) # type: ignore
+            .where(CommitDB.project_id == project_id)
+            .order_by(CommitDB.id) # type: ignore
+        ).all()
+        df = pd.DataFrame(rows, columns=["commit_id", "author", "date", "title", "insertions", "deletions", "day"])
+        df["date"] = pd.to_datetime(df["date"]).dt.tz_localize("UTC")
+        df["day"] = pd.to_datetime(df["day"]).dt.date
+        df["timestamp"] = df["date"]
+        return df.set_index("date")
+
+    @cached_property
+    def daily_stats(self) -> pd.DataFrame:
+        """Daily productivity statistics, built on first access; taken from the db when git.logs did not change"""
+        if self.git_logs.empty:
+            return pd.DataFrame()
+        if self._store_fresh:
+            daily = self._read_daily_stats()
+            if not daily.empty:
+                return daily
+        daily = self._calculate_daily_stats()
+        self._store_daily_stats(daily)
+        return daily
+
+    def _store_daily_stats(self, daily: pd.DataFrame):
+        with Session(self.engine) as session:
+            project = self._get_project(session)
+            session.exec(delete(DailyStatsDB).where(DailyStatsDB.project_id == project.id)) # type: ignore
+            if daily.empty:
+                return
+            session.execute(insert(DailyStatsDB), [
+                {
+                    "project_id": project.id, # type: ignore
+                    "date": datetime.combine(row.day, time()),
+                    "commits_count": row.commits,
+                    "insertions_total": row.insertions,
+                    "deletions_total": row.deletions,
+                    "net_changes": row.net_changes,
+                    "avg_commit_size": row.avg_commit_size,
+                }
+                for row in daily.itertuples(index=False)
+            ])
+            session.commit()
+
+    def _read_daily_stats(self) -> pd.DataFrame:
+        with Session(self.engine) as session:
+            project = self._get_project(session)
+            rows = session.exec(
+                select(DailyStatsDB.date, DailyStatsDB.commits_count, DailyStatsDB.insertions_total,
+                       DailyStatsDB.deletions_total, DailyStatsDB.net_changes, DailyStatsDB.avg_commit_size)
+                .where(DailyStatsDB.project_id == project.id) # type: ignore
+                .order_by(DailyStatsDB.date) # type: ignore
+            ).all()
+        daily = pd.DataFrame(rows, columns=["day", "commits", "insertions", "deletions", "net_changes", "avg_commit_size"])
+        daily["day"] = pd.to_datetime(daily["day"]).dt.date
+        return daily
 
     def _preprocess_data(self):
         """Preprocess loaded data for analysis"""
+        # Task summary values, counted once instead of on every get_summary call
+        self._category_counts = self.closed_tasks_df["category"].value_counts(sort=False)
+        self._cat_codes = self.closed_tasks_df["category"].cat.codes.to_numpy()
+        finished = self.closed_tasks_df["finished_at"].to_numpy(dtype=np.int64, na_value=0)
+        finished = finished[finished > 0]
+        self._first_last = (int(finished.min()), int(finished.max())) if len(finished) else (None, None)
+        # get_logs keep-masks by excluded titles, shared by repeated filters
+        self._title_masks = {}
+
         if not self.git_logs.empty:
             # Remove initial commit if it's empty/initial
             if len(self.git_logs) > 1:
-                first_commit = self.git_logs.iloc[0]
-                if any(keyword in first_commit.get("title", "").lower()
-                       for keyword in ["initial", "init", "first"]):
+                if self.git_logs["title"].iat[0].strip().lower().startswith(("init", "first")):
                     self.git_logs = self.git_logs.iloc[1:]
 
-            # Calculate daily stats
-            self.daily_stats = self._calculate_daily_stats()
-        else:
-            self.daily_stats = pd.DataFrame()
+            self._build_day_index()
+
+    def _build_day_index(self):
+        """Cache a (day, time) sorted permutation of git_logs for range lookups and first/last commit"""
+        days = pd.to_datetime(self.git_logs["day"]).to_numpy().astype("datetime64[D]")
+        self._day_order = np.lexsort((self.git_logs.index.values, days))  # NaT sorts last
+        self._day_sorted = days[self._day_order]
+        self._dated_commits = int(np.count_nonzero(~np.isnat(days)))
 
     def _calculate_daily_stats(self) -> pd.DataFrame:
         """Calculate daily productivity statistics"""
-        daily = (
-            self.git_logs
-            .groupby("day")
-            .agg(
-                commits=("title", "count"),
-                insertions=("insertions", "sum"),
-                deletions=("deletions", "sum")
-            )
-            .reset_index()
-        )
+        # Unsorted grouping: only the aggregated days are sorted, not the commits
+        by_day = self.git_logs.groupby("day", sort=False, observed=True)
+        # Both sums in one agg call; a named agg also taking ("title", "size") is slower than size() below
+        daily = by_day.agg({"insertions": "sum", "deletions": "sum"})
+        # Rows per day; every stored commit has a title, so this is the commit count
+        daily["commits"] = by_day.size()
+        daily = daily[["commits", "insertions", "deletions"]].sort_index().reset_index()
         daily["net_changes"] = daily["insertions"] - daily["deletions"]
         daily["avg_commit_size"] = (daily["insertions"] + daily["deletions"]) / daily["commits"]
         return daily
@@ -64,44 +286,80 @@ class PMContext:
             category: Optional[str] = None
     ) -> List[ClosedTask]:
         """Get tasks filtered by date range and category"""
-        filtered = []
+        tasks_df = self.closed_tasks_df
+        mask = np.ones(len(tasks_df), dtype=bool)
+
+        # Date filter, tasks without finish date are always kept
         if from_date:
-            from_timestamp = from_date.timestamp()
+            mask &= (tasks_df["finished_at"] >= int(from_date.timestamp())).fillna(True).to_numpy()
         if to_date:
-            to_timestamp = to_date.timestamp()
-
-        for task in self.closed_tasks:
-            # Date filter
-            if from_date and task.finished_at and task.finished_at > from_timestamp:
-                continue
-            if to_date and task.finished_at and task.finished_at < to_timestamp:
-                continue
-
-            # Category filter
-            if category and task.category.value != category:
-                continue
+            mask &= (tasks_df["finished_at"] <= int(to_date.timestamp())).fillna(True).to_numpy()
 
-            filtered.append(task)
+        # Category filter
+        if category:
+            mask &= self._cat_codes == CATEGORY_CODES.get(category, -1)
 
-        return filtered
+        return self._tasks_from_frame(tasks_df[mask])
 
     def get_logs(
             self,
             from_date: Optional[datetime] = None,
-            to_date: Optional[datetime] = None
+            to_date: Optional[datetime] = None,
+            exclude_titles: Tuple[str, ...] = (),
+            with_text: bool = True
     ) -> pd.DataFrame:
-        """Get git logs filtered by date range"""
+        """
+        Get git logs filtered by date range, without commits whose stripped title is in exclude_titles.
+        The commit texts of the selected commits are read from the db unless with_text is False.
+        Returned frames may share data with the context: add columns freely, do not edit values in place.
+        """
         if self.git_logs.empty:
             return pd.DataFrame()
+        if not from_date and not to_date:
+            if not exclude_titles:
+                return self._with_text(self.git_logs.copy(deep=False), with_text)
+            rows = np.arange(len(self.git_logs))
+        else:
+            lo, hi = 0, self._dated_commits
+            if from_date:
+                lo = np.searchsorted(self._day_sorted[:hi], np.datetime64(from_date, "D"), side="left")
+            if to_date:
+                hi = np.searchsorted(self._day_sorted[:hi], np.datetime64(to_date, "D"), side="right")
+            # Keep the original git log order of the selected commits
+            rows = np.sort(self._day_order[lo:hi])
 
-        mask = pd.Series(True, index=self.git_logs.index)
+        if exclude_titles:
+            # Dropped while picking rows, so the logs are copied once, already filtered
+            rows = rows[self._title_mask(exclude_titles)[rows]]
+        # take already builds a new frame
+        return self._with_text(self.git_logs.take(rows), with_text) # type: ignore
 
-        if from_date:
-            mask = mask & (self.git_logs["day"] >= from_date)
-        if to_date:
-            mask = mask & (self.git_logs["day"] <= to_date)
+    def _with_text(self, logs: pd.DataFrame, with_text: bool) -> pd.DataFrame:
+        """Add the text column of the commits in logs, read in batches of commit ids"""
+        if not with_text:
+            return logs
+        commit_ids = logs["commit_id"].tolist()
+        texts = {}
+        with Session(self.engine) as session:
+            for start in range(0, len(commit_ids), TEXT_QUERY_SIZE):
+                texts.update(session.exec(
+                    select(CommitDB.id, CommitDB.text)
+                    .where(CommitDB.id.in_(commit_ids[start:start + TEXT_QUERY_SIZE])) # type: ignore
+                ).all())
+        # Arrow strings: per-commit lengths and slicing run in Arrow kernels, not per-row Python
+        logs.insert(0, "text", pd.array(
+            [texts[commit_id] for commit_id in commit_ids], dtype=pd.ArrowDtype(pa.large_string())
+        ))
+        return logs
 
-        return self.git_logs[mask].copy() # type: ignore
+    def _title_mask(self, exclude_titles: Tuple[str, ...]) -> np.ndarray:
+        """Commits to keep, as a numpy mask over git_logs rows; built once per set of titles"""
+        key = tuple(sorted(exclude_titles))
+        mask = self._title_masks.get(key)
+        if mask is None:
+            titles = np.array([title.strip() for title in self.git_logs["title"].tolist()], dtype=object)
+            mask = self._title_masks[key] = ~np.isin(titles, key)
+        return mask
 
     def get_daily_stats(self) -> pd.DataFrame:
         """Get daily productivity statistics"""
@@ -109,23 +367,27 @@ class PMContext:
 
     def get_summary(self) -> dict:
         """Get project summary"""
+        first_task, last_task = self._first_last
+        has_commits = not self.git_logs.empty and self._dated_commits > 0
         return {
-            "total_tasks": len(self.closed_tasks),
+            "total_tasks": len(self.closed_tasks_df),
             "total_commits": len(self.git_logs),
             "date_range": {
-                "first_task": datetime.fromtimestamp(min((t.finished_at for t in self.closed_tasks if t.finished_at), default=None)), #type: ignore
-                "last_task": datetime.fromtimestamp(max((t.finished_at for t in self.closed_tasks if t.finished_at), default=None)), #type: ignore
-                "first_commit": self.git_logs.index.min() if not self.git_logs.empty else None,
-                "last_commit": self.git_logs.index.max() if not self.git_logs.empty else None,
+                # Local time, aware so it is not read as UTC
+                "first_task": datetime.fromtimestamp(int(first_task)).astimezone() if first_task else None,
+                "last_task": datetime.fromtimestamp(int(last_task)).astimezone() if last_task else None,
+                "first_commit": self.git_logs.index[self._day_order[0]] if has_commits else None,
+                "last_commit": self.git_logs.index[self._day_order[self._dated_commits - 1]] if has_commits else None,
             },
             "categories": {
-                cat.name: len([t for t in self.closed_tasks if t.category == cat])
-                for cat in Category
+                cat: int(count)
+                for cat, count in self._category_counts.items()
             }
         }
 
 
-context = PMContext()
-print(context.closed_tasks)
-print(context.git_logs)
-print(context.get_summary())
+if __name__ == "__main__":
+    context = PMContext()
+    print(context.closed_tasks)
+    print(context.git_logs)
+    print(context.get_summary())
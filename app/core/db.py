@@ -36,6 +36,8 @@ class ProjectDB(SQLModel, table=True):
     description: Optional[str] = None
     added_at: datetime = Field(default_factory=datetime.utcnow)
     last_analyzed_at: Optional[datetime] = None
+    git_logs_mtime: Optional[datetime] = None  # mtime of the git.logs the stored commits were parsed from
+    last_ingested_sha: Optional[str] = None  # HEAD at the last git fetch, the next one reads only newer commits
 
 
 class ContributorDB(SQLModel, table=True):
@@ -82,12 +84,13 @@ class CommitDB(SQLModel, table=True):
 
     # Git metadata
     hash: str = Field(index=True, unique=True)
-    author_date: datetime = Field(index=True)
+    author_date: Optional[datetime] = Field(default=None, index=True)  # None if the date line was not parsed
     commit_date: Optional[datetime] = None
 
     # Commit content
     message: str
     title: str = Field(index=True)
+    text: Optional[str] = None  # Full `git log -p` block, diff included
 
     # Metrics
     insertions: int = Field(default=0)
@@ -99,7 +102,7 @@ class CommitDB(SQLModel, table=True):
     tags: Optional[str] = None  # JSON string or comma-separated
 
     # Derived fields for fast querying
-    day: datetime = Field(index=True)  # Date-only part of author_date
+    day: Optional[datetime] = Field(default=None, index=True)  # Date-only part of author_date
 
 
 class DailyStatsDB(SQLModel, table=True):
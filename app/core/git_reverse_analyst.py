@@ -1,14 +1,28 @@
+import asyncio
+import os
+import re
 from pathlib import Path
-from typing import Any, Generator
+from typing import Any, AsyncGenerator, Generator, Optional
 from models import Category, ClosedTask
-from ollama import Client, GenerateResponse
+from ollama import AsyncClient, GenerateResponse
+from ollama_client import OLLAMA_HOST, get_client, get_loop
 import pandas as pd
-import json
-from datetime import datetime, date
+import orjson
+from datetime import datetime
+
+
+# Commits below this many changed lines, or with a title like these, are not worth a model call
+MIN_COMMIT_SIZE = 5
+TRIVIAL_TITLE_RE = re.compile(r'^(chore|bump|typo|fmt|wip)', re.I)
+# Consecutive small commits of one day share a request, up to this many commits and chars of text
+MAX_BATCH = 4
+BATCH_CHARS = 8000
 
 
 class GitReverseAnalyst:
-    def __init__(self, tasks, project_title,model_name="gemma3:12b", data_dir: str = "../data"):
+    def __init__(self, tasks, project_title,model_name="gemma3:12b", data_dir: str = "../data",
+                 parallel: int = int(os.getenv("OLLAMA_NUM_PARALLEL", 4)), num_ctx: int = 32768,
+                 endpoints: Optional[list[str]] = None, batch_chars: int = BATCH_CHARS):
         self.data_dir = Path(data_dir) / project_title
         self.etalon_tasks = tasks
         self.setup_prompt = f"""
@@ -61,120 +75,263 @@ class GitReverseAnalyst:
             Now analyze the next commit and extract tasks following the protocol. Title is for hinting, do not rate them.
             And dont blind believe them, main data is git commit message.
             """
+        # Invariant parts of every commit request, built once
+        self._prompt_head = f"{self.base_prompt}\n "
+        self._fixed_prompt_len = len(self.setup_prompt) + len(self._prompt_head)
         
-        self.client: Client = Client(
-            host='http://localhost:11434',
-            headers={'x-some-header': 'some-value'}
-        )
+        # Shared loop, so the clients keep their pooled connections across analysts and raters
+        self._loop = get_loop()
+        # One client per `ollama serve` replica, requests are spread over them round-robin
+        self.clients: list[AsyncClient] = [get_client(endpoint) for endpoint in endpoints or [OLLAMA_HOST]]
         self.model_name = model_name
+        self.parallel = parallel  # in-flight requests per endpoint
+        # Fixed for all requests: a changed num_ctx makes Ollama reload the model and drop the prompt cache
+        self.num_ctx = num_ctx
+        self.keep_alive = '30m'
+        self.batch_chars = batch_chars  # 0 sends every commit on its own
+
+    def analyze_git_logs(self, logs: pd.DataFrame) -> Generator[tuple[list[ClosedTask], float | None], None, None]:
+        """Sync wrapper over analyze_git_logs_async for non-async callers"""
+        agen = self.analyze_git_logs_async(logs)
+        try:
+            while True:
+                try:
+                    yield self._loop.run_until_complete(agen.__anext__())
+                except StopAsyncIteration:
+                    break
+        finally:
+            self._loop.run_until_complete(agen.aclose())
 
-    def analyze_git_logs(self, logs: pd.DataFrame):
+    async def analyze_git_logs_async(self, logs: pd.DataFrame) -> AsyncGenerator[tuple[list[ClosedTask], float | None], None]:
+        """
+        Yields (tasks, None) per request in history order and ([], speed) at the end. A request
+        covers one commit or a batch of consecutive small commits of the same day.
+
+        While the unfinished_moves carry-over is empty, next requests are sent speculatively
+        so up to `parallel` requests per endpoint are in flight. A non-empty carry-over drops the
+        speculative results and the next request is resent with it.
+        """
         logs["text_size"] = logs["text"].str.len()
         print(logs["text_size"])
-        commits = logs.to_dict('records')
-        commits.reverse()
-        print(commits[0]['title'], commits[0].keys())
-        
+        sizes = logs['insertions'].to_numpy() + logs['deletions'].to_numpy()
+        trivial = (sizes < MIN_COMMIT_SIZE) | logs['title'].str.strip().str.match(TRIVIAL_TITLE_RE).to_numpy()
+        trivial = trivial[::-1]
+        # Oldest first; namedtuple rows are much cheaper than dict records
+        commits = list(logs.iloc[::-1].itertuples(index=False))
+        print(commits[0].title, commits[0]._fields)
+        batches, trivial = self._batch_commits(commits[2:], trivial[2:])
+
+        semaphores = [asyncio.Semaphore(self.parallel) for _ in self.clients]
+        n_clients = len(self.clients)
+        window = self.parallel * n_clients
+        in_flight: dict[int, asyncio.Task] = {}
         tasks_doiting: list[ClosedTask] = []
         unfinished_moves = ""
         total_chars = 0
         total__time = 0
-        for i in range(2, len(commits)):
-            attempts = 3
-            while attempts > 0:
-                try:
-                    print(f'Handle {i} commit {commits[i]['title']} with length {commits[i]['text_size']}')
-                    total_chars += commits[i]['text_size']
-                    response = self.analyze_commit(commits[i], unfinished_moves)
-                    print(f'Receive response {"successfully" if response.done else "error"} for {int(response.total_duration / 10 ** 9)} seconds \n Text: {response.response}')
-                    total__time += response.total_duration / 10 ** 9
-                    tasks, unfinished_moves = self._parse_response(response, commits[i]['timestamp'])
+        try:
+            for i, batch in enumerate(batches):
+                if trivial[i]:
+                    # Keeps the carry-over for the next real commit
+                    tasks = [self._trivial_task(batch[0])]
                     tasks_doiting += tasks
-                    break
-                except Exception as e:
-                    print(e)
-                    attempts -= 1
-            
-            yield tasks, None
+                    yield tasks, None
+                    continue
+
+                if not unfinished_moves:
+                    for j in range(i, min(i + window, len(batches))):
+                        if j not in in_flight and not trivial[j]:
+                            k = j % n_clients
+                            in_flight[j] = asyncio.create_task(
+                                self._analyze_with_retries(batches[j], "", self.clients[k], semaphores[k])
+                            )
+                pending = in_flight.pop(i, None)
+                if pending is None:
+                    k = i % n_clients
+                    pending = asyncio.create_task(
+                        self._analyze_with_retries(batch, unfinished_moves, self.clients[k], semaphores[k])
+                    )
 
+                tasks, unfinished_moves, duration = await pending
+                total_chars += sum(commit.text_size for commit in batch)
+                total__time += duration
+                tasks_doiting += tasks
+                if unfinished_moves:
+                    for speculative in in_flight.values():
+                        speculative.cancel()
+                    in_flight.clear()
+
+                yield tasks, None
+        finally:
+            for speculative in in_flight.values():
+                speculative.cancel()
+
+        # No model time at all when every commit was trivial
+        speed = total_chars / total__time if total__time else 0.0
         print(f"Git Reverse analyst handle {len(commits)} git commits and reinstate\
-               {len(tasks_doiting)} tasks with speed of {total_chars / total__time:.2f} chars per second.")
+               {len(tasks_doiting)} tasks with speed of {speed:.2f} chars per second.")
         self.update_project_data(tasks_doiting)
-        self.last_handle_speed = total_chars / total__time
-        return tasks_doiting, total_chars / total__time
-    
+        self.last_handle_speed = speed
+        yield [], self.last_handle_speed
+
+    def _batch_commits(self, commits, trivial) -> tuple[list[tuple], list[bool]]:
+        """
+        Group consecutive non-trivial commits of one day into batches of up to MAX_BATCH commits
+        and batch_chars of text; trivial and larger commits stay on their own.
+        Returns the batches and whether each one is a trivial commit.
+        """
+        batches: list[tuple] = []
+        batch_trivial: list[bool] = []
+        batch: list = []
+        size = 0
+        for commit, is_trivial in zip(commits, trivial):
+            if batch and (
+                is_trivial
+                or len(batch) == MAX_BATCH
+                or size + commit.text_size > self.batch_chars
+                or commit.day != batch[0].day
+            ):
+                batches.append(tuple(batch))
+                batch_trivial.append(False)
+                batch, size = [], 0
+            if is_trivial:
+                batches.append((commit,))
+                batch_trivial.append(True)
+            else:
+                batch.append(commit)
+                size += commit.text_size
+        if batch:
+            batches.append(tuple(batch))
+            batch_trivial.append(False)
+        return batches, batch_trivial
+
+    def _trivial_task(self, commit) -> ClosedTask:
+        """Infrastructure task standing for a commit skipped by size or title"""
+        return ClosedTask(
+            text=commit.title.strip(),
+            category=Category.I,
+            estimated_time=None,
+            min_skill_level=None,
+            planned_at=None,
+            started_at=None,
+            finished_at=int(commit.timestamp.timestamp()) if pd.notna(commit.timestamp) else None,
+            lines_added=commit.insertions,
+            lines_removed=commit.deletions,
+        )
+
+    async def _analyze_with_retries(self, commits, unfinished_moves, client, semaphore, attempts=3):
+        """Returns (tasks, unfinished_moves, seconds spent); the carry-over is kept if every attempt fails"""
+        # Tasks of a batch are dated by its last commit, all of them are from the same day
+        title, timestamp = commits[-1].title, commits[-1].timestamp
+        text_size = sum(commit.text_size for commit in commits)
+        while attempts > 0:
+            try:
+                async with semaphore:
+                    print(f'Handle {len(commits)} commit(s) up to {title} with length {text_size}')
+                    response = await self.analyze_commits(commits, unfinished_moves, client)
+                if response is None:
+                    break
+                duration = response.total_duration / 10 ** 9
+                print(f'Receive response {"successfully" if response.done else "error"} for {int(duration)} seconds \n Text: {response.response}')
+                tasks, moves = self._parse_response(response, timestamp)
+                return tasks, moves, duration
+            except Exception as e:
+                print(e)
+                attempts -= 1
+        return [], unfinished_moves, 0
+
     def update_project_data(self, tasks: list[ClosedTask]) -> None:
+        """
+        Write predicted tasks to predicted_tasks/predicted.parquet, partitioned by month.
+        Months in this run replace their previous partition; read one back with
+        pd.read_parquet(path, filters=[('month', '==', 10)]).
+        """
         # Todo add db and save tody
+        if not tasks:
+            return
         predict_dir = self.data_dir / 'predicted_tasks'
         predict_dir.mkdir(exist_ok=True)
         tasks_df = pd.DataFrame(tasks)
+        tasks_df['category'] = [c.value for c in tasks_df['category']]
+        tasks_df['min_skill_level'] = [s.value if s else None for s in tasks_df['min_skill_level']]
         tasks_df['date'] = pd.to_datetime(tasks_df['finished_at'], unit='s')
-        tasks_df['month'] = tasks_df['date'].dt.month #type: ignore
+        # Undated tasks go to month 0, hive partitions can't hold nulls
+        tasks_df['month'] = tasks_df['date'].dt.month.fillna(0).astype(int) #type: ignore
         tasks_df = tasks_df.set_index('date')
-        g = tasks_df.groupby(pd.Grouper(key='month'))
-        chunks = [(name, group) for name, group in g]
-        print(chunks)
-        for chunk in chunks:
-            filename = date(2000, chunk[0], 1).strftime('%B') + f'_{datetime.now().year%1000}.txt' # type: ignore
-            chunk[1].to_csv(predict_dir/filename)
-
-
+        tasks_df.to_parquet(
+            predict_dir / 'predicted.parquet',
+            partition_cols=['month'],
+            compression='zstd',
+            existing_data_behavior='delete_matching',
+        )
 
-    def analyze_commit(self, commit, unfinished_moves=""):
+    async def analyze_commits(self, commits, unfinished_moves="", client: Optional[AsyncClient] = None) -> GenerateResponse | None:
+        """One request for consecutive commits, oldest first; their tasks come back in one list"""
+        commit_texts = "\n".join(
+            f"""
+            <commit_text>
+            {commit.text[:100000]}
+            </commit_text>
+            """
+            for commit in commits
+        )
         prompt = f"""
             PREVIOUS_UNFINISHED_MOVES = "{unfinished_moves}"
 
-            COMMIT:
-            <commit_text>
-            {commit['text'][:100000]}
-            </commit_text>
+            {"COMMIT" if len(commits) == 1 else f"{len(commits)} CONSECUTIVE COMMITS, OLDEST FIRST, TASKS OF ALL OF THEM"}:
+            {commit_texts}
 
-            COMMIT_TITLE: "{commit['title']}"
+            COMMIT_TITLE: {", ".join(f'"{commit.title}"' for commit in commits)}
 
             STRINGLY Follow the JSON protocol exactly.
             """
-        full_prompt = f"{self.setup_prompt}\n{self.base_prompt}\n {prompt}\n{self.setup_prompt}"
-        print(f'full_prompt size {len(full_prompt)}')
-        if len(full_prompt) > 90000:
+        # setup_prompt goes as system prompt: it is the same for every commit,
+        # so Ollama reuses its cached KV prefix and only evaluates the tail
+        print(f'full_prompt size {self._fixed_prompt_len + len(prompt)}')
+        if len(prompt) > 90000 - self._fixed_prompt_len:
             print("too long")
-            return [], unfinished_moves
-        return self.client.generate(
+            return None
+        full_prompt = self._prompt_head + prompt
+        return await (client or self.clients[0]).generate(
             model=self.model_name, 
+            system=self.setup_prompt,
             prompt = full_prompt,
+            keep_alive=self.keep_alive,
             options={
-                "keep_alive": 0,
-                "num_predict": 512,
+                "num_ctx": self.num_ctx,
+                "num_predict": 512 if len(commits) == 1 else 1024,
                 "temperature": 0,
                 }
             )
 
     def _parse_response(self, response, closed_at):
-        text = response.response
-        if text.startswith("```"):
-            text = "\n".join(text.split('\n')[1:-1])
-        result = json.loads(text)
+        text = response.response.strip().removeprefix("```json").removeprefix("```").removesuffix("```")
+        result = orjson.loads(text)
         print(result)
-        tasks = [ClosedTask(task["text"], task["category"], task)
+        finished_at = int(closed_at.timestamp()) if pd.notna(closed_at) else None
+        tasks = [ClosedTask.from_llm(task["text"], task["category"], finished_at)
             for task in result['tasks']
             ]
         return tasks, result['unfinished_moves']
  
-from context_keeper import context
-
-
-okt_tasks = context.get_tasks(datetime(2025, 10, 1), datetime(2025, 11, 1))
-analyst = GitReverseAnalyst(okt_tasks, 'nodis_project')
-git_logs = context.get_logs()
-git_logs = git_logs[git_logs['title'] != 'initial commit']
-print(git_logs)
-task_predicted = []
-with open("all_predicted_tasks.txt", 'w') as out:
-    for tasks, speed in analyst.analyze_git_logs(git_logs): # type: ignore
-        task_predicted += tasks
-        out.write('\n'+'\n'.join([str(t) for t in tasks]))
-        if speed:
-            print(f"speed of work for {analyst.model_name} is {speed} chars per second")
-            break
+if __name__ == "__main__":
+    from context_keeper import PMContext
+
+    context = PMContext()
+
+    okt_tasks = context.get_tasks(datetime(2025, 10, 1), datetime(2025, 11, 1))
+    analyst = GitReverseAnalyst(okt_tasks, 'nodis_project')
+    # Titles are matched stripped, as git log indents them
+    git_logs = context.get_logs(exclude_titles=('initial commit',))
+    print(git_logs)
+    task_predicted = []
+    with open("all_predicted_tasks.txt", 'w') as out:
+        for tasks, speed in analyst.analyze_git_logs(git_logs): # type: ignore
+            task_predicted += tasks
+            out.write('\n'+'\n'.join([str(t) for t in tasks]))
+            if speed:
+                print(f"speed of work for {analyst.model_name} is {speed} chars per second")
+                break
 
 
 # task_predicted = [ClosedTask(text=line[:-2], category=Category(line[-1]),estimated_time=None, min_skill_level=None, planned_at=None, started_at=None, finished_at=None)for line in open("all_predicted_tasks.txt").readlines()]
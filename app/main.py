@@ -3,26 +3,28 @@
 Misanthrope PM - Advanced Project Management Analytics with Git Integration
 """
 
-import json
+import csv
+import re
 import shutil
+import sys
+from contextlib import nullcontext
 from datetime import date, datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import TYPE_CHECKING, Optional, List, Dict, Any, Tuple
 import subprocess
 
+import orjson
 import typer
-from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
-from rich.tree import Tree
-from rich import print as rprint
-
-from misanthrope_pm.core.context import PMContext
-from misanthrope_pm.core.project_manager import ProjectManager
-from misanthrope_pm.analytics.predictor import TaskPredictor
-from misanthrope_pm.analytics.contributor_analyzer import ContributorAnalyzer
-from misanthrope_pm.reports.generator import ReportGenerator
+
+# Rich, pandas and the analytics modules are imported inside the commands that use them,
+# so a command only pays for its own imports
+from project_manager import ProjectManager
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from rich.console import Console, Group, RenderableType
+    from rich.text import Text
 
 # Initialize Typer app
 app = typer.Typer(
@@ -33,8 +35,51 @@ app = typer.Typer(
     context_settings={"help_option_names": ["-h", "--help"]},
 )
 
-console = Console()
-error_console = Console(stderr=True, style="bold red")
+
+class _LazyConsole:
+    """Rich console created on first use, so importing this module does not import rich"""
+
+    def __init__(self, **kwargs):
+        self._kwargs = kwargs
+        self._console = None
+
+    def get(self) -> 'Console':
+        """The real console, for Rich APIs that need a Console instance"""
+        if self._console is None:
+            from rich.console import Console
+            self._console = Console(**self._kwargs)
+        return self._console
+
+    def __getattr__(self, name):
+        return getattr(self.get(), name)
+
+
+console = _LazyConsole()
+error_console = _LazyConsole(stderr=True, style="bold red")
+
+
+@lru_cache(maxsize=None)
+def _pm() -> ProjectManager:
+    """One ProjectManager per process, shared by the commands"""
+    return ProjectManager()
+
+
+class _NullProgress:
+    """Stands in for Progress around steps too short to be worth a live display"""
+
+    def add_task(self, *args, **kwargs) -> int:
+        return 0
+
+    def update(self, *args, **kwargs):
+        pass
+
+
+def _progress(*columns, show: bool = True):
+    """Transient progress display repainting 4 times a second, or a no-op one when show is False"""
+    if not show:
+        return nullcontext(_NullProgress())
+    from rich.progress import Progress
+    return Progress(*columns, console=console.get(), transient=True, refresh_per_second=4)
 
 
 @app.command("add")
@@ -79,20 +124,22 @@ def add_project(
     $ misanthrope-pm add ~/projects/my-repo --name awesome-project --force
     $ misanthrope-pm add . --no-analyze
     """
+    from rich.panel import Panel
+    from rich.text import Text
+    from rich.progress import SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
+
     try:
         # Determine project name
         if not project_name:
             project_name = project_path.name
 
-        project_manager = ProjectManager()
+        project_manager = _pm()
 
-        with Progress(
+        with _progress(
                 SpinnerColumn(),
                 TextColumn("[progress.description]{task.description}"),
                 BarColumn(),
                 TaskProgressColumn(),
-                console=console,
-                transient=True,
         ) as progress:
             # Task 1: Initialize project
             task1 = progress.add_task(
@@ -138,22 +185,26 @@ def add_project(
 
         # Show results
         console.print(Panel.fit(
-            f"[bold green]✓ Project '{project_name}' added successfully![/bold green]\n\n"
-            f"[cyan]Project ID:[/cyan] {project.id}\n"
-            f"[cyan]Repository:[/cyan] {project.repo_path}\n"
-            f"[cyan]Data Path:[/cyan] {project.data_path}\n"
-            f"[cyan]Created:[/cyan] {project.created_at}\n",
-            title="[bold]Project Added[/bold]",
+            _fields(
+                ("Project ID", "cyan", project.id),
+                ("Repository", "cyan", project.repo_path),
+                ("Data Path", "cyan", project.data_path),
+                ("Created", "cyan", project.added_at),
+                header=(f"✓ Project '{project_name}' added successfully!", "bold green"),
+            ),
+            title=Text("Project Added", style="bold"),
             border_style="green"
         ))
 
         if fetch_git:
             console.print(Panel.fit(
-                f"[cyan]Commits:[/cyan] {git_stats['total_commits']}\n"
-                f"[cyan]Contributors:[/cyan] {git_stats['contributors']}\n"
-                f"[cyan]Date Range:[/cyan] {git_stats['date_range']}\n"
-                f"[cyan]Total Changes:[/cyan] +{git_stats['total_insertions']}/-{git_stats['total_deletions']}",
-                title="[bold]Git Statistics[/bold]",
+                _fields(
+                    ("Commits", "cyan", git_stats['total_commits']),
+                    ("Contributors", "cyan", git_stats['contributors']),
+                    ("Date Range", "cyan", git_stats['date_range']),
+                    ("Total Changes", "cyan", f"+{git_stats['total_insertions']}/-{git_stats['total_deletions']}"),
+                ),
+                title=Text("Git Statistics", style="bold"),
                 border_style="cyan"
             ))
 
@@ -205,16 +256,16 @@ def analyze_project(
     $ misanthrope-pm analyze my-project --period 30d --detailed
     $ misanthrope-pm analyze my-project --format json --output analysis.json
     """
+    from rich.progress import SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
+
     try:
-        project_manager = ProjectManager()
+        project_manager = _pm()
 
-        with Progress(
+        with _progress(
                 SpinnerColumn(),
                 TextColumn("[progress.description]{task.description}"),
                 BarColumn(),
                 TaskProgressColumn(),
-                console=console,
-                transient=True,
         ) as progress:
             # Task 1: Load project
             task1 = progress.add_task(
@@ -222,8 +273,7 @@ def analyze_project(
                 total=100
             )
 
-            project = project_manager.get_project(project_name)
-            context = PMContext(project.data_path)
+            project_manager.get_project(project_name)
             progress.update(task1, completed=100)
 
             # Task 2: Analyze project
@@ -233,13 +283,15 @@ def analyze_project(
             )
 
             # Calculate date range if period specified
-            from_date = None
+            # The period goes to git as --since, from_date only guards the result
+            from_date = since = None
             if period:
-                from_date = _parse_period_to_date(period)
+                from_date, since = _parse_period_to_date(period)
 
             analysis = project_manager.analyze_project(
                 project_name,
                 from_date=from_date,
+                since=since,
                 detailed=detailed
             )
             progress.update(task2, completed=100)
@@ -251,7 +303,7 @@ def analyze_project(
             )
 
             if output_format.lower() == "json":
-                output = json.dumps(analysis, indent=2, default=str)
+                output = _dump_json(analysis)
             else:
                 output = _format_analysis_text(analysis, detailed)
 
@@ -259,10 +311,13 @@ def analyze_project(
 
         # Output results
         if output_file:
-            output_file.write_text(output)
+            if isinstance(output, bytes):
+                output_file.write_bytes(output)
+            else:
+                output_file.write_text(_render_text(output), encoding='utf-8')
             console.print(f"[green]✓[/green] Analysis saved to {output_file}")
         else:
-            console.print(output)
+            console.print(output.decode() if isinstance(output, bytes) else _group(output))
 
     except Exception as e:
         error_console.print(f"Error analyzing project: {e}")
@@ -301,8 +356,13 @@ def predict_tasks(
     $ misanthrope-pm predict my-project --task "Fix login bug"
     $ misanthrope-pm predict my-project --input tasks.txt --format json
     """
+    from rich.progress import SpinnerColumn, TextColumn
+
     try:
-        project_manager = ProjectManager()
+        # Inside the try: without the analytics package the command ends with an error, not a traceback
+        from misanthrope_pm.analytics.predictor import TaskPredictor
+
+        project_manager = _pm()
         project = project_manager.get_project(project_name)
 
         predictor = TaskPredictor(project.data_path)
@@ -314,24 +374,28 @@ def predict_tasks(
             tasks_to_predict.append(task_description)
         elif input_file:
             if input_file.exists():
-                tasks_to_predict = input_file.read_text().splitlines()
+                # Read line by line, without a copy of the whole file or newline translation;
+                # blank lines are not tasks
+                with input_file.open('r', encoding='utf-8', newline='') as fh:
+                    tasks_to_predict = [line.rstrip('\r\n') for line in fh if line.strip()]
             else:
                 error_console.print(f"Input file not found: {input_file}")
                 raise typer.Exit(code=1)
         else:
+            from core.context_keeper import PMContext
+
             # Predict for existing tasks in project
-            context = PMContext(project.data_path)
-            tasks_to_predict = [task.text for task in context.closed_tasks[:10]]  # First 10 tasks
+            data_path = Path(project.data_path)
+            context = PMContext(str(data_path.parent), data_path.name)
+            tasks_to_predict = context.closed_tasks_df["text"].head(10).tolist()  # First 10 tasks
 
         if not tasks_to_predict:
             error_console.print("No tasks to predict")
             raise typer.Exit(code=1)
 
-        with Progress(
+        with _progress(
                 SpinnerColumn(),
                 TextColumn("[progress.description]{task.description}"),
-                console=console,
-                transient=True,
         ) as progress:
             task = progress.add_task(
                 description="Training prediction model...",
@@ -344,9 +408,9 @@ def predict_tasks(
 
         # Format output
         if output_format.lower() == "json":
-            output = json.dumps(predictions, indent=2, default=str)
+            output = _dump_json(predictions).decode()
         else:
-            output = _format_predictions_text(predictions)
+            output = _group(_format_predictions_text(predictions))
 
         console.print(output)
 
@@ -387,30 +451,30 @@ def show_contributors(
     $ misanthrope-pm contributors my-project --period 30d --top 5
     $ misanthrope-pm contributors my-project --detailed
     """
-    try:
-        project_manager = ProjectManager()
-        project = project_manager.get_project(project_name)
+    from rich.progress import SpinnerColumn, TextColumn
 
-        analyzer = ContributorAnalyzer(project.data_path)
+    try:
+        project_manager = _pm()
+        project_manager.get_project(project_name)
 
         # Calculate date range if period specified
-        from_date = None
+        from_date = since = None
         if period:
-            from_date = _parse_period_to_date(period)
+            from_date, since = _parse_period_to_date(period)
 
-        with Progress(
+        with _progress(
                 SpinnerColumn(),
                 TextColumn("[progress.description]{task.description}"),
-                console=console,
-                transient=True,
         ) as progress:
             task = progress.add_task(
                 description="Analyzing contributors...",
                 total=None
             )
 
-            contributors = analyzer.analyze_contributors(
+            contributors = project_manager.analyze_contributors(
+                project_name,
                 from_date=from_date,
+                since=since,
                 top_n=top,
                 detailed=detailed
             )
@@ -423,7 +487,7 @@ def show_contributors(
         else:
             output = _format_contributors_summary(contributors)
 
-        console.print(output)
+        console.print(_group(output))
 
     except Exception as e:
         error_console.print(f"Error analyzing contributors: {e}")
@@ -458,19 +522,21 @@ def show_statistics(
     $ misanthrope-pm stats --compare --export stats.csv
     """
     try:
-        project_manager = ProjectManager()
+        project_manager = _pm()
 
         if project_name:
+            from core.context_keeper import PMContext
+
             # Show single project stats
             project = project_manager.get_project(project_name)
-            context = PMContext(project.data_path)
+            data_path = Path(project.data_path)
+            context = PMContext(str(data_path.parent), data_path.name)
 
             stats = {
                 "project": project.name,
                 "summary": context.get_summary(),
                 "git_stats": project_manager.get_git_statistics(project.name),
-                "daily_stats": context.get_daily_stats().to_dict(orient="records")
-                if not context.daily_stats.empty else []
+                "daily_stats": context.get_daily_stats() if not context.daily_stats.empty else None
             }
 
             output = _format_single_project_stats(stats)
@@ -478,28 +544,34 @@ def show_statistics(
         else:
             # Show all projects
             projects = project_manager.list_projects()
+            # All projects' git stats in one pass instead of a lookup per project
+            stats_by_name = project_manager.get_all_git_statistics()
 
             if compare:
-                output = _format_compare_projects(projects, project_manager)
+                import pandas as pd
+                compare_df = pd.DataFrame([{"project": p.name, **stats_by_name.get(p.name, {})} for p in projects])
+                output = _format_compare_projects(compare_df)
             else:
                 output = _format_all_projects_list(projects)
 
         # Export if requested
         if export:
             if export.suffix == '.json':
-                export.write_text(json.dumps(stats if project_name else projects, indent=2, default=str))
+                export.write_bytes(_dump_json(
+                    stats if project_name else [{**p.model_dump(), "git_stats": stats_by_name.get(p.name, {})} for p in projects]
+                ))
             elif export.suffix == '.csv':
-                # Convert to CSV
-                import pandas as pd
-                df = pd.DataFrame([{
-                    "project": p.name,
-                    "created": p.created_at,
-                    "commits": project_manager.get_git_statistics(p.name).get("total_commits", 0)
-                } for p in projects])
-                df.to_csv(export, index=False)
+                # Three fixed columns, no DataFrame needed
+                with export.open('w', newline='') as fh:
+                    writer = csv.writer(fh)
+                    writer.writerow(["project", "created", "commits"])
+                    writer.writerows(
+                        (p.name, p.added_at, stats_by_name.get(p.name, {}).get("total_commits", 0))
+                        for p in projects
+                    )
             console.print(f"[green]✓[/green] Statistics exported to {export}")
 
-        console.print(output)
+        console.print(_group(output))
 
     except Exception as e:
         error_console.print(f"Error showing statistics: {e}")
@@ -530,6 +602,11 @@ def generate_report(
             "--template",
             help="Custom report template name",
         ),
+        open_browser: bool = typer.Option(
+            sys.stdout.isatty(),
+            "--open/--no-open",
+            help="Open HTML reports in a browser (default: only when run from a terminal)",
+        ),
 ):
     """
     Generate professional reports for stakeholders.
@@ -540,20 +617,26 @@ def generate_report(
     $ misanthrope-pm report my-project
     $ misanthrope-pm report my-project --type monthly --output ./my-reports
     $ misanthrope-pm report my-project --template executive
+    $ misanthrope-pm report my-project --no-open
     """
+    from rich.panel import Panel
+    from rich.text import Text
+    from rich.progress import SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
+
     try:
-        project_manager = ProjectManager()
+        # Inside the try: without the reports package the command ends with an error, not a traceback
+        from misanthrope_pm.reports.generator import ReportGenerator
+
+        project_manager = _pm()
         project = project_manager.get_project(project_name)
 
         generator = ReportGenerator(project.data_path)
 
-        with Progress(
+        with _progress(
                 SpinnerColumn(),
                 TextColumn("[progress.description]{task.description}"),
                 BarColumn(),
                 TaskProgressColumn(),
-                console=console,
-                transient=True,
         ) as progress:
             task = progress.add_task(
                 description=f"Generating {report_type} report...",
@@ -569,17 +652,19 @@ def generate_report(
             progress.update(task, completed=100)
 
         console.print(Panel.fit(
-            f"[bold green]✓ Report generated successfully![/bold green]\n\n"
-            f"[cyan]Project:[/cyan] {project_name}\n"
-            f"[cyan]Report Type:[/cyan] {report_type}\n"
-            f"[cyan]Output File:[/cyan] {report_path}\n",
-            title="[bold]Report Generated[/bold]",
+            _fields(
+                ("Project", "cyan", project_name),
+                ("Report Type", "cyan", report_type),
+                ("Output File", "cyan", report_path),
+                header=("✓ Report generated successfully!", "bold green"),
+            ),
+            title=Text("Report Generated", style="bold"),
             border_style="green"
         ))
 
         # Try to open the report
         try:
-            if report_path.suffix == '.html':
+            if open_browser and report_path.suffix == '.html':
                 console.print("\n[cyan]Opening report in browser...[/cyan]")
                 import webbrowser
                 webbrowser.open(f"file://{report_path.absolute()}")
@@ -617,14 +702,16 @@ def update_project(
     $ misanthrope-pm update my-project
     $ misanthrope-pm update my-project --no-git
     """
+    from rich.progress import SpinnerColumn, TextColumn
+
     try:
-        project_manager = ProjectManager()
+        project_manager = _pm()
 
-        with Progress(
+        # Only a git fetch takes long enough to show progress for
+        with _progress(
                 SpinnerColumn(),
                 TextColumn("[progress.description]{task.description}"),
-                console=console,
-                transient=True,
+                show=fetch_git,
         ) as progress:
             task = progress.add_task(
                 description=f"Updating project '{project_name}'...",
@@ -675,6 +762,8 @@ def remove_project(
     $ misanthrope-pm remove old-project
     $ misanthrope-pm remove old-project --keep-data --yes
     """
+    from rich.progress import SpinnerColumn, TextColumn
+
     try:
         if not confirm:
             console.print(f"[yellow]⚠[/yellow] Are you sure you want to remove project '{project_name}'?")
@@ -682,13 +771,13 @@ def remove_project(
                 console.print("[yellow]Removal cancelled[/yellow]")
                 return
 
-        project_manager = ProjectManager()
+        project_manager = _pm()
 
-        with Progress(
+        # Removing is a quick local operation
+        with _progress(
                 SpinnerColumn(),
                 TextColumn("[progress.description]{task.description}"),
-                console=console,
-                transient=True,
+                show=False,
         ) as progress:
             task = progress.add_task(
                 description=f"Removing project '{project_name}'...",
@@ -730,62 +819,120 @@ def list_projects(
     $ misanthrope-pm list --detailed --sort activity
     """
     try:
-        project_manager = ProjectManager()
+        project_manager = _pm()
         projects = project_manager.list_projects()
 
         if not projects:
             console.print("[yellow]No projects found. Use 'misanthrope-pm add' to add a project.[/yellow]")
             return
 
+        # All projects' git stats in one pass, for sorting and the detailed table
+        stats_by_name = project_manager.get_all_git_statistics()
+        projects = _sort_projects(projects, stats_by_name, sort_by)
         if detailed:
-            output = _format_projects_detailed(projects, project_manager, sort_by)
+            output = _format_projects_detailed(projects, stats_by_name)
         else:
-            output = _format_projects_simple(projects, sort_by)
+            output = _format_projects_simple(projects)
 
-        console.print(output)
+        console.print(_group(output))
 
     except Exception as e:
         error_console.print(f"Error listing projects: {e}")
         raise typer.Exit(code=1)
 
 
-def _parse_period_to_date(period: str) -> date:
-    """Parse period string like '30d', '3m', '1y' to date"""
-    today = date.today()
-
-    if period.endswith('d'):
-        days = int(period[:-1])
-        return today - timedelta(days=days)
-    elif period.endswith('w'):
-        weeks = int(period[:-1])
-        return today - timedelta(weeks=weeks)
-    elif period.endswith('m'):
-        months = int(period[:-1])
-        # Approximate months
-        return today - timedelta(days=months * 30)
-    elif period.endswith('y'):
-        years = int(period[:-1])
-        return today - timedelta(days=years * 365)
+def _group(renderables: List['RenderableType']) -> 'Group':
+    """One renderable for the whole output, blank lines between parts as before"""
+    from rich.console import Group
+
+    spaced = []
+    for renderable in renderables:
+        if spaced:
+            spaced.append("")
+        spaced.append(renderable)
+    return Group(*spaced)
+
+
+def _render_text(renderables: List['RenderableType']) -> str:
+    """Render once into a string, for output files"""
+    with console.capture() as capture:
+        console.print(_group(renderables))
+    return capture.get()
+
+
+def _json_default(value: Any) -> Any:
+    # DataFrames become records, serialized and indented like the rest of the output
+    if hasattr(value, "columns") and hasattr(value, "to_dict"):
+        return value.to_dict(orient="records")
+    # pandas Timestamps as datetimes; NaT is the only value not equal to itself
+    if hasattr(value, "to_pydatetime"):
+        return value.to_pydatetime() if value == value else None
+    return str(value)
+
+
+def _fields(*lines: Tuple[str, str, Any], header: Optional[Tuple[str, str]] = None) -> 'Text':
+    """Panel body of styled "Label: value" lines, assembled from segments instead of parsed markup"""
+    from rich.text import Text
+
+    parts: List[Any] = [header, "\n\n"] if header else []
+    for i, (label, style, value) in enumerate(lines):
+        if i:
+            parts.append("\n")
+        parts += [(f"{label}:", style), f" {value}"]
+    return Text.assemble(*parts)
+
+
+def _dump_json(data: Any) -> bytes:
+    """
+    Indented JSON as bytes, written out as is; numpy values and dates are serialized natively.
+    Naive datetimes are taken as UTC, local ones have to be made aware before.
+    """
+    return orjson.dumps(
+        data,
+        default=_json_default,
+        option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS,
+    )
+
+
+# Days per period unit; months and years are approximate
+PERIOD_UNITS = {'d': 1, 'w': 7, 'm': 30, 'y': 365}
+PERIOD_RE = re.compile(r'^(\d+)([dwmy])$')
+
+
+@lru_cache(maxsize=256)
+def _parse_period_to_date(period: str) -> Tuple[date, str]:
+    """Parse period string like '30d', '3m', '1y' to date and the matching git log --since argument"""
+    match = PERIOD_RE.match(period)
+    if match:
+        from_date = date.today() - timedelta(days=int(match.group(1)) * PERIOD_UNITS[match.group(2)])
     else:
         try:
-            return datetime.strptime(period, "%Y-%m-%d").date()
+            from_date = datetime.strptime(period, "%Y-%m-%d").date()
         except ValueError:
             raise ValueError(f"Invalid period format: {period}")
+    return from_date, f"--since={from_date.isoformat()}"
 
 
-def _format_analysis_text(analysis: Dict[str, Any], detailed: bool) -> str:
+def _format_analysis_text(analysis: Dict[str, Any], detailed: bool) -> List['RenderableType']:
     """Format analysis results as text"""
+    import pandas as pd
+    from rich.panel import Panel
+    from rich.text import Text
+    from rich.table import Table
+
     panels = []
 
     # Summary panel
     summary_panel = Panel.fit(
-        f"[bold cyan]Project:[/bold cyan] {analysis.get('project_name', 'N/A')}\n"
-        f"[bold cyan]Period:[/bold cyan] {analysis.get('period_start', 'N/A')} to {analysis.get('period_end', 'N/A')}\n"
-        f"[bold cyan]Total Commits:[/bold cyan] {analysis.get('total_commits', 0)}\n"
-        f"[bold cyan]Total Tasks:[/bold cyan] {analysis.get('total_tasks', 0)}\n"
-        f"[bold cyan]Contributors:[/bold cyan] {analysis.get('contributors_count', 0)}\n"
-        f"[bold cyan]Productivity Score:[/bold cyan] {analysis.get('productivity_score', 0):.2f}",
-        title="[bold]Project Analysis Summary[/bold]",
+        _fields(
+            ("Project", "bold cyan", analysis.get('project_name', 'N/A')),
+            ("Period", "bold cyan", f"{analysis.get('period_start', 'N/A')} to {analysis.get('period_end', 'N/A')}"),
+            ("Total Commits", "bold cyan", analysis.get('total_commits', 0)),
+            ("Total Tasks", "bold cyan", analysis.get('total_tasks', 0)),
+            ("Contributors", "bold cyan", analysis.get('contributors_count', 0)),
+            ("Productivity Score", "bold cyan", f"{analysis.get('productivity_score', 0):.2f}"),
+        ),
+        title=Text("Project Analysis Summary", style="bold"),
         border_style="cyan"
     )
     panels.append(summary_panel)
@@ -798,17 +945,24 @@ def _format_analysis_text(analysis: Dict[str, Any], detailed: bool) -> str:
         cat_table.add_column("Count", style="green")
         cat_table.add_column("Percentage", style="yellow")
 
-        total = sum(categories.values())
-        for cat, count in sorted(categories.items(), key=lambda x: x[1], reverse=True):
-            percentage = (count / total * 100) if total > 0 else 0
+        counts = pd.Series(categories).sort_values(ascending=False, kind="stable")
+        total = counts.sum()
+        percentages = counts / total * 100 if total > 0 else counts * 0
+        for (cat, count), percentage in zip(counts.items(), percentages):
             cat_table.add_row(cat, str(count), f"{percentage:.1f}%")
 
-        panels.append(str(cat_table))
+        panels.append(cat_table)
 
     # Daily activity (last 7 days)
-    daily_stats = analysis.get('daily_stats', [])
-    if daily_stats and len(daily_stats) > 0:
-        recent_days = daily_stats[-7:] if len(daily_stats) > 7 else daily_stats
+    daily_stats = analysis.get('daily_stats')
+    if daily_stats is not None and len(daily_stats) > 0:
+        # Daily stats come as a frame (or records); only the last 7 rows are read
+        recent_days = (
+            pd.DataFrame(daily_stats).tail(7)
+            .reindex(columns=["day", "commits", "insertions", "deletions"])
+            .fillna({"day": "", "commits": 0, "insertions": 0, "deletions": 0})
+            .astype({"commits": int, "insertions": int, "deletions": int})
+        )
 
         daily_table = Table(title="Recent Activity (Last 7 Days)", show_header=True)
         daily_table.add_column("Date", style="cyan")
@@ -816,16 +970,16 @@ def _format_analysis_text(analysis: Dict[str, Any], detailed: bool) -> str:
         daily_table.add_column("Changes (+/-)", style="yellow")
         daily_table.add_column("Net", style="magenta")
 
-        for day in recent_days:
-            net = day.get('insertions', 0) - day.get('deletions', 0)
+        for day in recent_days.itertuples(index=False):
+            net = int(day.insertions - day.deletions)
             daily_table.add_row(
-                str(day.get('day', '')),
-                str(day.get('commits', 0)),
-                f"+{day.get('insertions', 0)}/-{day.get('deletions', 0)}",
+                str(day.day),
+                str(day.commits),
+                f"+{day.insertions}/-{day.deletions}",
                 f"{net:+d}"
             )
 
-        panels.append(str(daily_table))
+        panels.append(daily_table)
 
     # Detailed information if requested
     if detailed:
@@ -847,28 +1001,32 @@ def _format_analysis_text(analysis: Dict[str, Any], detailed: bool) -> str:
                     f"{changes:,}"
                 )
 
-            panels.append(str(contrib_table))
+            panels.append(contrib_table)
 
         # Code metrics
         metrics = analysis.get('code_metrics', {})
         if metrics:
             metrics_panel = Panel.fit(
-                f"[cyan]Avg Commits/Day:[/cyan] {metrics.get('avg_commits_per_day', 0):.1f}\n"
-                f"[cyan]Avg Changes/Commit:[/cyan] {metrics.get('avg_changes_per_commit', 0):.1f}\n"
-                f"[cyan]Bus Factor:[/cyan] {metrics.get('bus_factor', 0):.1f}\n"
-                f"[cyan]Active Days:[/cyan] {metrics.get('active_days', 0)}",
-                title="[bold]Code Metrics[/bold]",
+                _fields(
+                    ("Avg Commits/Day", "cyan", f"{metrics.get('avg_commits_per_day', 0):.1f}"),
+                    ("Avg Changes/Commit", "cyan", f"{metrics.get('avg_changes_per_commit', 0):.1f}"),
+                    ("Bus Factor", "cyan", f"{metrics.get('bus_factor', 0):.1f}"),
+                    ("Active Days", "cyan", metrics.get('active_days', 0)),
+                ),
+                title=Text("Code Metrics", style="bold"),
                 border_style="blue"
             )
-            panels.append(str(metrics_panel))
+            panels.append(metrics_panel)
 
-    return "\n\n".join(panels)
+    return panels
 
 
-def _format_predictions_text(predictions: List[Dict[str, Any]]) -> str:
+def _format_predictions_text(predictions: List[Dict[str, Any]]) -> List['RenderableType']:
     """Format task predictions as text"""
+    from rich.table import Table
+
     if not predictions:
-        return "[yellow]No predictions available[/yellow]"
+        return ["[yellow]No predictions available[/yellow]"]
 
     table = Table(title="Task Predictions", show_header=True)
     table.add_column("Task", style="cyan", no_wrap=False)
@@ -887,11 +1045,14 @@ def _format_predictions_text(predictions: List[Dict[str, Any]]) -> str:
             pred.get('predicted_category', 'Unknown')
         )
 
-    return str(table)
+    return [table]
 
 
-def _format_contributors_summary(contributors: List[Dict[str, Any]]) -> str:
+def _format_contributors_summary(contributors: List[Dict[str, Any]]) -> List['RenderableType']:
     """Format contributor summary"""
+    import pandas as pd
+    from rich.table import Table
+
     table = Table(title="Contributors Summary", show_header=True)
     table.add_column("Rank", style="cyan")
     table.add_column("Name", style="green")
@@ -901,50 +1062,67 @@ def _format_contributors_summary(contributors: List[Dict[str, Any]]) -> str:
     table.add_column("Net", style="magenta")
     table.add_column("Activity %", style="blue")
 
-    total_commits = sum(c.get('commits', 0) for c in contributors)
-
-    for i, contrib in enumerate(contributors, 1):
-        activity_pct = (contrib.get('commits', 0) / total_commits * 100) if total_commits > 0 else 0
-        net = contrib.get('insertions', 0) - contrib.get('deletions', 0)
+    # One frame for all rows: net and activity share are column operations
+    df = pd.DataFrame.from_records(contributors, columns=["author", "commits", "insertions", "deletions"])
+    df[["commits", "insertions", "deletions"]] = df[["commits", "insertions", "deletions"]].fillna(0).astype(int)
+    df["author"] = df["author"].fillna("Unknown")
+    df["net"] = df["insertions"] - df["deletions"]
+    total_commits = df["commits"].sum()
+    df["activity_pct"] = df["commits"] / total_commits * 100 if total_commits > 0 else 0.0
 
+    for i, contrib in enumerate(df.itertuples(index=False), 1):
         table.add_row(
             str(i),
-            contrib.get('author', 'Unknown'),
-            str(contrib.get('commits', 0)),
-            str(contrib.get('insertions', 0)),
-            str(contrib.get('deletions', 0)),
-            f"{net:+d}",
-            f"{activity_pct:.1f}%"
+            contrib.author,
+            str(contrib.commits),
+            str(contrib.insertions),
+            str(contrib.deletions),
+            f"{contrib.net:+d}",
+            f"{contrib.activity_pct:.1f}%"
         )
 
-    return str(table)
+    return [table]
+
+
+# Panel border of each detailed contributor, by rank
+RANK_BORDERS = ("cyan", "green", "yellow", "yellow", "yellow")
 
 
-def _format_contributors_detailed(contributors: List[Dict[str, Any]]) -> str:
+def _format_contributors_detailed(contributors: List[Dict[str, Any]]) -> List['RenderableType']:
     """Format detailed contributor information"""
+    from rich.panel import Panel
+    from rich.text import Text
+
     panels = []
+    title = Text("Contributor Details", style="bold")
 
-    for i, contrib in enumerate(contributors[:5], 1):  # Top 5
+    for i, (contrib, border) in enumerate(zip(contributors, RANK_BORDERS), 1):  # Top 5
         panel = Panel.fit(
-            f"[bold cyan]Rank {i}: {contrib.get('author', 'Unknown')}[/bold cyan]\n\n"
-            f"[green]Commits:[/green] {contrib.get('commits', 0)}\n"
-            f"[green]Insertions:[/green] +{contrib.get('insertions', 0):,}\n"
-            f"[red]Deletions:[/red] -{contrib.get('deletions', 0):,}\n"
-            f"[magenta]Net Changes:[/magenta] {contrib.get('insertions', 0) - contrib.get('deletions', 0):+d}\n"
-            f"[yellow]First Commit:[/yellow] {contrib.get('first_commit', 'N/A')}\n"
-            f"[yellow]Last Commit:[/yellow] {contrib.get('last_commit', 'N/A')}\n"
-            f"[blue]Active Days:[/blue] {contrib.get('active_days', 0)}\n"
-            f"[blue]Avg Commits/Day:[/blue] {contrib.get('avg_commits_per_day', 0):.2f}",
-            title=f"[bold]Contributor Details[/bold]",
-            border_style="cyan" if i == 1 else "green" if i == 2 else "yellow"
+            _fields(
+                ("Commits", "green", contrib.get('commits', 0)),
+                ("Insertions", "green", f"+{contrib.get('insertions', 0):,}"),
+                ("Deletions", "red", f"-{contrib.get('deletions', 0):,}"),
+                ("Net Changes", "magenta", f"{contrib.get('insertions', 0) - contrib.get('deletions', 0):+d}"),
+                ("First Commit", "yellow", contrib.get('first_commit', 'N/A')),
+                ("Last Commit", "yellow", contrib.get('last_commit', 'N/A')),
+                ("Active Days", "blue", contrib.get('active_days', 0)),
+                ("Avg Commits/Day", "blue", f"{contrib.get('avg_commits_per_day', 0):.2f}"),
+                header=(f"Rank {i}: {contrib.get('author', 'Unknown')}", "bold cyan"),
+            ),
+            title=title,
+            border_style=border
         )
-        panels.append(str(panel))
+        panels.append(panel)
 
-    return "\n\n".join(panels)
+    return panels
 
 
-def _format_single_project_stats(stats: Dict[str, Any]) -> str:
+def _format_single_project_stats(stats: Dict[str, Any]) -> List['RenderableType']:
     """Format single project statistics"""
+    from rich.panel import Panel
+    from rich.text import Text
+    from rich.table import Table
+
     project = stats.get('project', 'Unknown')
     summary = stats.get('summary', {})
     git_stats = stats.get('git_stats', {})
@@ -953,27 +1131,29 @@ def _format_single_project_stats(stats: Dict[str, Any]) -> str:
 
     # Project info panel
     info_panel = Panel.fit(
-        f"[bold cyan]Project:[/bold cyan] {project}\n"
-        f"[cyan]Created:[/cyan] {summary.get('date_range', {}).get('first_commit', 'N/A')}\n"
-        f"[cyan]Last Activity:[/cyan] {summary.get('date_range', {}).get('last_commit', 'N/A')}",
-        title="[bold]Project Information[/bold]",
+        _fields(
+            ("Project", "bold cyan", project),
+            ("Created", "cyan", summary.get('date_range', {}).get('first_commit', 'N/A')),
+            ("Last Activity", "cyan", summary.get('date_range', {}).get('last_commit', 'N/A')),
+        ),
+        title=Text("Project Information", style="bold"),
         border_style="cyan"
     )
-def _format_all_projects_list(projects: List[Any]) -> str:
-    """Format
-    panels.append(str(info_panel))
+    panels.append(info_panel)
 
     # Git statistics panel
     git_panel = Panel.fit(
-        f"[green]Total Commits:[/green] {git_stats.get('total_commits', 0)}\n"
-        f"[green]Contributors:[/green] {git_stats.get('contributors', 0)}\n"
-        f"[yellow]Total Insertions:[/yellow] +{git_stats.get('total_insertions', 0):,}\n"
-        f"[red]Total Deletions:[/red] -{git_stats.get('total_deletions', 0):,}\n"
-        f"[magenta]Net Changes:[/magenta] {git_stats.get('total_insertions', 0) - git_stats.get('total_deletions', 0):+d}",
-        title="[bold]Git Statistics[/bold]",
+        _fields(
+            ("Total Commits", "green", git_stats.get('total_commits', 0)),
+            ("Contributors", "green", git_stats.get('contributors', 0)),
+            ("Total Insertions", "yellow", f"+{git_stats.get('total_insertions', 0):,}"),
+            ("Total Deletions", "red", f"-{git_stats.get('total_deletions', 0):,}"),
+            ("Net Changes", "magenta", f"{git_stats.get('total_insertions', 0) - git_stats.get('total_deletions', 0):+d}"),
+        ),
+        title=Text("Git Statistics", style="bold"),
         border_style="green"
     )
-    panels.append(str(git_panel))
+    panels.append(git_panel)
 
     # Task categories
     categories = summary.get('categories', {})
@@ -985,7 +1165,115 @@ def _format_all_projects_list(projects: List[Any]) -> str:
         for cat, count in categories.items():
             cat_table.add_row(cat, str(count))
 
-        panels.append(str(cat_table))
+        panels.append(cat_table)
+
+    return panels
+
+
+def _format_all_projects_list(projects: List[Any]) -> List['RenderableType']:
+    """Format the list of all projects"""
+    from rich.table import Table
+
+    table = Table(title="Projects", show_header=True)
+    table.add_column("Name", style="cyan")
+    table.add_column("Repository", style="green")
+    table.add_column("Created", style="yellow")
+
+    for project in projects:
+        table.add_row(project.name, str(project.repo_path), str(project.added_at))
 
-    return "\n\n".join(panels)
+    return [table]
+
+
+def _sort_projects(projects: List[Any], stats_by_name: Dict[str, dict], sort_by: str) -> List[Any]:
+    """Projects by name, newest first by creation, largest first by net lines, latest commit first by activity"""
+    keys = {
+        "name": (lambda p: p.name, False),
+        "created": (lambda p: p.added_at, True),
+        "size": (lambda p: stats_by_name.get(p.name, {}).get("total_insertions", 0)
+                 - stats_by_name.get(p.name, {}).get("total_deletions", 0), True),
+        "activity": (lambda p: stats_by_name.get(p.name, {}).get("last_commit") or "", True),
+    }
+    if sort_by.lower() not in keys:
+        raise ValueError(f"Unknown sort key '{sort_by}', use one of: {', '.join(keys)}")
+    key, reverse = keys[sort_by.lower()]
+    return sorted(projects, key=key, reverse=reverse)
+
+
+def _format_projects_simple(projects: List[Any]) -> List['RenderableType']:
+    """Format project names and repositories"""
+    from rich.table import Table
+
+    table = Table(title="Projects", show_header=True)
+    table.add_column("Name", style="cyan")
+    table.add_column("Repository", style="green")
+
+    for project in projects:
+        table.add_row(project.name, str(project.repo_path))
+
+    return [table]
+
+
+def _format_projects_detailed(projects: List[Any], stats_by_name: Dict[str, dict]) -> List['RenderableType']:
+    """Format projects with their git stats; projects never fetched show N/A"""
+    from rich.table import Table
+
+    table = Table(title="Projects", show_header=True)
+    table.add_column("Name", style="cyan")
+    table.add_column("Repository", style="green")
+    table.add_column("Created", style="yellow")
+    table.add_column("Commits", style="green")
+    table.add_column("Contributors", style="yellow")
+    table.add_column("Changes (+/-)", style="blue")
+    table.add_column("Last Commit", style="magenta")
+
+    for project in projects:
+        stats = stats_by_name.get(project.name)
+        if stats:
+            changes = f"+{stats['total_insertions']:,}/-{stats['total_deletions']:,}"
+            table.add_row(
+                project.name, str(project.repo_path), project.added_at.strftime("%Y-%m-%d"),
+                str(stats["total_commits"]), str(stats["contributors"]), changes,
+                str(stats.get("last_commit") or "N/A"),
+            )
+        else:
+            table.add_row(project.name, str(project.repo_path), project.added_at.strftime("%Y-%m-%d"),
+                          "N/A", "N/A", "N/A", "N/A")
+
+    return [table]
+
+
+def _format_compare_projects(compare_df: 'pd.DataFrame') -> List['RenderableType']:
+    """Format git stats of all projects side by side, most active first"""
+    from rich.table import Table
+
+    if compare_df.empty:
+        return ["[yellow]No projects to compare[/yellow]"]
+
+    columns = ["total_commits", "contributors", "total_insertions", "total_deletions"]
+    compare_df = (
+        compare_df.set_index("project")
+        .reindex(columns=columns)
+        .fillna(0)
+        .astype(int)
+        .sort_values("total_commits", ascending=False)
+    )
+    compare_df["net_changes"] = compare_df["total_insertions"] - compare_df["total_deletions"]
+
+    table = Table(title="Projects Comparison", show_header=True)
+    table.add_column("Project", style="cyan")
+    table.add_column("Commits", style="green")
+    table.add_column("Contributors", style="yellow")
+    table.add_column("Changes (+/-)", style="blue")
+    table.add_column("Net", style="magenta")
+
+    for project in compare_df.itertuples():
+        table.add_row(
+            project.Index,
+            str(project.total_commits),
+            str(project.contributors),
+            f"+{project.total_insertions:,}/-{project.total_deletions:,}",
+            f"{project.net_changes:+d}"
+        )
 
+    return [table]
@@ -1,3 +1,5 @@
+import math
+import re
 from enum import Enum
 from typing import Any, Optional
 from dataclasses import dataclass
@@ -9,66 +11,63 @@ class Category(Enum):
     F = 'F'
     B = 'B'
 
+# Plain dict lookup, cheaper than the Enum call for every parsed task
+CATEGORY_BY_VALUE = {c.value: c for c in Category}
+
 class SkillLevel(Enum):
     junior = 'junior'
     middle = 'middle'
     senior = 'senior'
     architect = 'architect'
 
+SKILL_BY_VALUE = {s.value: s for s in SkillLevel}
+
+# Strings int() accepts for sure: one optional sign, ASCII digits only
+INT_RE = re.compile(r'[+-]?[0-9]+')
+
 def to_int(num):
-    try:
+    # Type checks instead of a try/except around int()
+    if isinstance(num, str):
+        num = num.strip()
+        return int(num) if INT_RE.fullmatch(num) else None
+    if isinstance(num, float):
+        return int(num) if math.isfinite(num) else None
+    if hasattr(num, '__index__'):
         return int(num)
-    except Exception as e:
-        return None
+    return None
     
-@dataclass
+@dataclass(slots=True)
 class ClosedTask:
     text: str
     category: Category
-    estimated_time: Optional[int]
-    min_skill_level: Optional[SkillLevel]
-    planned_at: Optional[int]
-    started_at: Optional[int]
-    finished_at: Optional[int]
-    lines_added: Optional[int]
-    lines_removed: Optional[int]
-    
+    estimated_time: Optional[int] = None
+    min_skill_level: Optional[SkillLevel] = None
+    planned_at: Optional[int] = None
+    started_at: Optional[int] = None
+    finished_at: Optional[int] = None
+    lines_added: Optional[int] = None
+    lines_removed: Optional[int] = None
 
-    def __init__(self, text: str, category: str, **data: dict):
-        self.text = text
-        self.category = Category(category)
-        data.pop("text")
-        data.pop("category")
-        
-        
-        for key, value in data.items():
-            # Handle specific fields
-            if key == "estimated_time":
-                self.estimated_time = to_int(value) if value is not None else None
-            elif key == "min_skill_level":
-                if isinstance(value, SkillLevel):
-                    self.min_skill_level = value
-                elif value is not None:
-                    self.min_skill_level = SkillLevel(value)
-            elif key == "planned_at":
-                self.planned_at = to_int(value) if value is not None else None
-            elif key == "started_at":
-                self.started_at = to_int(value) if value is not None else None
-            elif key == "finished_at":
-                self.finished_at = to_int(value) if value is not None else None
-            elif key == "lines_added":
-                self.lines_added = to_int(value) if value is not None else None
-            elif key == "lines_removed":
-                self.lines_removed = to_int(value) if value is not None else None
-            
-        # (text=line[:-3],
-        #     category=Category(line.strip()[-1]),
-        #     estimated_time=None,
-        #     min_skill_level=None,
-        #     planned_at=None,
-        #     started_at=None,
-        #     finished_at=int(datetime(datetime.now().year, datetime.strptime(file_path.stem.split('_')[0], '%B').month, 30, 21, 20, 0).timestamp())
-        #     )
+    @classmethod
+    def from_raw(cls, text: str, category: Any, **data: Any) -> "ClosedTask":
+        """Build a task from raw values: category and skill level by value, numbers as int-like"""
+        skill = data.get("min_skill_level")
+        return cls(
+            text,
+            category if isinstance(category, Category) else CATEGORY_BY_VALUE[category],
+            to_int(data.get("estimated_time")),
+            skill if skill is None or isinstance(skill, SkillLevel) else SKILL_BY_VALUE[skill],
+            to_int(data.get("planned_at")),
+            to_int(data.get("started_at")),
+            to_int(data.get("finished_at")),
+            to_int(data.get("lines_added")),
+            to_int(data.get("lines_removed")),
+        )
+
+    @classmethod
+    def from_llm(cls, text: str, category: str, finished_at: Optional[int]) -> "ClosedTask":
+        """Build a task parsed from model output"""
+        return cls(text, CATEGORY_BY_VALUE[category], finished_at=finished_at)
 
     def __str__(self):
         base =  f'{self.text} {self.category}'
@@ -0,0 +1,33 @@
+import asyncio
+from functools import lru_cache
+
+import httpx
+from ollama import AsyncClient
+
+OLLAMA_HOST = 'http://localhost:11434'
+# Connections kept open to one `ollama serve`, enough for parallel analyst and rater requests
+LIMITS = httpx.Limits(max_keepalive_connections=16, max_connections=32)
+
+
+@lru_cache(maxsize=None)
+def get_loop() -> asyncio.AbstractEventLoop:
+    """
+    Event loop shared by the sync wrappers of every Ollama user: pooled connections belong to
+    the loop they were opened in, so one loop lets all of them reuse the same clients
+    """
+    return asyncio.new_event_loop()
+
+
+def get_client(host: str = OLLAMA_HOST) -> AsyncClient:
+    """One client, and so one connection pool, per Ollama endpoint for the whole process"""
+    # Cached by the host value, so get_client() and get_client(OLLAMA_HOST) are the same client
+    return _client(host.rstrip('/'))
+
+
+@lru_cache(maxsize=None)
+def _client(host: str) -> AsyncClient:
+    return AsyncClient(
+        host=host,
+        headers={'x-some-header': 'some-value'},
+        limits=LIMITS,
+    )
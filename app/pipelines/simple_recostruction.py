@@ -4,13 +4,12 @@ from core.git_reverse_analyst import GitReverseAnalyst
 
 @task
 def load_context():
-    context = PMContext()
-    logs = context.get_logs()
-    return context, logs
+    return PMContext()
 
 @task
-def filter_commits(logs):
-    return logs[logs['title'] != 'initial commit']
+def filter_commits(context):
+    # Filtered while the logs are selected, not on a full copy of them
+    return context.get_logs(exclude_titles=('initial commit',))
 
 @task
 def analyze_commits(logs, etalon_tasks):
@@ -29,8 +28,8 @@ def save_tasks(tasks):
 
 @flow
 def git_to_tasks_pipeline():
-    context, logs = load_context()
-    logs_filtered = filter_commits(logs)
+    context = load_context()
+    logs_filtered = filter_commits(context)
     tasks = analyze_commits(logs_filtered, context.get_tasks())
     count = save_tasks(tasks)
     print(f"Pipeline completed. {count} tasks saved.")
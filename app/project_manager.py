@@ -0,0 +1,407 @@
+import shutil
+import subprocess
+from datetime import date, datetime, time
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import orjson
+from sqlmodel import Session, select
+
+from core.db import ProjectDB, create_tables, get_engine
+
+# One record per commit: RS, then the header fields split by US, then NUL-terminated numstat entries
+LOG_FORMAT = "%x1e%H%x1f%an%x1f%ae%x1f%aI%x1f%s"
+READ_SIZE = 1 << 16
+# Commits per git log call when walking back to a date; doubled until the date is reached
+FIRST_BATCH, MAX_BATCH = 64, 1024
+STATS_FILE = "git_stats.json"
+# Registry of the tracked projects, in the data root next to their data folders
+REGISTRY_DB = "projects.db"
+
+
+def _parse_record(record: bytes) -> dict:
+    header, _, numstat = record.partition(b"\0")
+    sha, author, email, author_date, title = header.decode(errors="replace").split("\x1f", 4)
+    insertions = deletions = 0
+    files = []
+    fields = numstat.lstrip(b"\n").split(b"\0")
+    i = 0
+    while i < len(fields):
+        if not fields[i]:
+            i += 1
+            continue
+        added, removed, path = fields[i].split(b"\t", 2)
+        if not path:  # rename: old and new path follow as their own fields
+            path = fields[i + 2]
+            i += 2
+        i += 1
+        # Binary files report "-" for both counts
+        insertions += int(added) if added != b"-" else 0
+        deletions += int(removed) if removed != b"-" else 0
+        files.append(path.decode(errors="replace"))
+    return {
+        "hash": sha,
+        "author": author,
+        "email": email,
+        "date": author_date,
+        "title": title,
+        "insertions": insertions,
+        "deletions": deletions,
+        "files": files,
+    }
+
+
+def iter_git_log(repo_path: Path, *args: str) -> Iterator[dict]:
+    """Stream commit metadata from a single `git log` process, one dict per commit as it arrives"""
+    process = subprocess.Popen(
+        ["git", "log", "-z", "--numstat", f"--format={LOG_FORMAT}", *args],
+        stdout=subprocess.PIPE, cwd=repo_path, bufsize=READ_SIZE,
+    )
+    buffer = b""
+    try:
+        while chunk := process.stdout.read(READ_SIZE): # type: ignore
+            buffer += chunk
+            *records, buffer = buffer.split(b"\x1e")
+            for record in records:
+                if record:
+                    yield _parse_record(record)
+        if buffer:
+            yield _parse_record(buffer)
+    finally:
+        process.stdout.close() # type: ignore
+        process.wait()
+
+
+def head_sha(repo_path: Path) -> str:
+    return subprocess.run(
+        ["git", "rev-parse", "HEAD"], cwd=repo_path, capture_output=True, text=True, check=True
+    ).stdout.strip()
+
+
+def _is_ancestor(repo_path: Path, sha: str, head: str) -> bool:
+    return subprocess.run(["git", "merge-base", "--is-ancestor", sha, head], cwd=repo_path).returncode == 0
+
+
+def _aware(moment: date) -> datetime:
+    """A date or datetime as an aware datetime, comparable to git's ISO dates; naive values are local time"""
+    if not isinstance(moment, datetime):
+        moment = datetime.combine(moment, time())
+    return moment if moment.tzinfo else moment.astimezone()
+
+
+def fetch_commits_until(repo_path: Path, from_date: date, *args: str) -> List[dict]:
+    """
+    Commits authored since from_date (a date, or a naive local or aware datetime), newest first.
+    The history is read in batches that double in size, so a short period costs one small
+    git log and a long one a handful of calls. args go to git log: a --since there stops git
+    itself at the period start.
+    """
+    from_date = _aware(from_date)
+    commits = []
+    size = FIRST_BATCH
+    while True:
+        batch = list(iter_git_log(repo_path, f"--max-count={size}", f"--skip={len(commits)}", *args))
+        commits += batch
+        if len(batch) < size or datetime.fromisoformat(batch[-1]["date"]) < from_date:
+            break
+        size = min(size * 2, MAX_BATCH)
+    return [c for c in commits if datetime.fromisoformat(c["date"]) >= from_date]
+
+
+def fetch_git_logs(repo_path: Path, data_dir: Path, *args: str, last_sha: Optional[str] = None) -> dict:
+    """
+    Write the full `git log -p` of the repository to data_dir/git.logs, streamed to disk, and
+    return the stats of the fetched history, counted by a second, diff-less git log read.
+
+    With last_sha (the "head" of a previous fetch) only last_sha..HEAD is read and prepended to
+    the existing git.logs; when HEAD has not moved, only the rev-parse and merge-base checks
+    run. A rewritten history falls back to a full fetch. The returned stats always cover the whole history.
+    """
+    data_dir.mkdir(parents=True, exist_ok=True)
+    logs_path = data_dir / "git.logs"
+    head = head_sha(repo_path)
+    incremental = (
+        last_sha is not None and logs_path.exists() and (data_dir / STATS_FILE).exists()
+        and _is_ancestor(repo_path, last_sha, head)
+    )
+    if incremental and last_sha == head:
+        return load_git_statistics(data_dir)
+    args = (*args, f"{last_sha}..{head}" if incremental else head)
+    if incremental:
+        new_logs = subprocess.run(
+            ["git", "log", "-p", *args], cwd=repo_path, capture_output=True, check=True
+        ).stdout
+        old_logs = logs_path.read_bytes()
+        with open(logs_path, "wb") as f:
+            f.write(new_logs)
+            if old_logs:
+                # git log -p separates commits with an empty line
+                f.write(b"\n")
+                f.write(old_logs)
+    else:
+        with open(logs_path, "wb") as f:
+            subprocess.run(["git", "log", "-p", *args], stdout=f, cwd=repo_path, check=True)
+
+    commits = insertions = deletions = 0
+    authors = set()
+    first = last = None
+    for commit in iter_git_log(repo_path, *args):
+        commits += 1
+        authors.add(commit["email"])
+        insertions += commit["insertions"]
+        deletions += commit["deletions"]
+        # git log walks newest first
+        last = last or commit["date"]
+        first = commit["date"]
+    stats = {
+        "head": head,
+        "total_commits": commits,
+        "contributors": len(authors),
+        "date_range": f"{first} - {last}" if commits else "",
+        "total_insertions": insertions,
+        "total_deletions": deletions,
+    }
+    stats = _save_git_statistics(data_dir, stats, authors, first, last, incremental)
+    load_git_statistics.cache_clear()
+    return stats
+
+
+def _contributors(commits: List[dict]) -> List[Dict[str, Any]]:
+    """Per-author commit stats of git log commits, most commits first"""
+    by_author: Dict[str, Dict[str, Any]] = {}
+    for commit in commits:
+        day = commit["date"][:10]
+        author = by_author.setdefault(commit["author"], {
+            "author": commit["author"], "commits": 0, "insertions": 0, "deletions": 0,
+            "first_commit": day, "last_commit": day, "days": set(),
+        })
+        author["commits"] += 1
+        author["insertions"] += commit["insertions"]
+        author["deletions"] += commit["deletions"]
+        author["first_commit"] = min(author["first_commit"], day)
+        author["last_commit"] = max(author["last_commit"], day)
+        author["days"].add(day)
+    contributors = sorted(by_author.values(), key=lambda a: a["commits"], reverse=True)
+    for author in contributors:
+        author["active_days"] = len(author.pop("days"))
+        author["avg_commits_per_day"] = author["commits"] / author["active_days"]
+    return contributors
+
+
+def _save_git_statistics(data_dir: Path, stats: dict, authors: set, first, last, incremental: bool) -> dict:
+    """Keep the whole-history stats next to git.logs, merging an incremental fetch into them; returns them"""
+    stats_path = data_dir / STATS_FILE
+    saved = orjson.loads(stats_path.read_bytes()) if incremental and stats_path.exists() else None
+    if saved:
+        authors |= set(saved["authors"])
+        first = saved["first_commit"] or first
+        stats = {
+            "head": stats["head"],
+            "total_commits": saved["total_commits"] + stats["total_commits"],
+            "total_insertions": saved["total_insertions"] + stats["total_insertions"],
+            "total_deletions": saved["total_deletions"] + stats["total_deletions"],
+        }
+    stats = {
+        **stats,
+        "contributors": len(authors),
+        "date_range": f"{first} - {last}" if first else "",
+        "first_commit": first,
+        "last_commit": last,
+        "authors": sorted(authors),
+    }
+    stats_path.write_bytes(orjson.dumps(stats))
+    return stats
+
+
+@lru_cache(maxsize=None)
+def load_git_statistics(data_dir: Path) -> dict:
+    """Stats of the last fetch of a project, {} before its first fetch; read from disk once per process"""
+    stats_path = data_dir / STATS_FILE
+    return orjson.loads(stats_path.read_bytes()) if stats_path.exists() else {}
+
+
+def load_all_git_statistics(data_root: Path) -> Dict[str, dict]:
+    """Stats of every project under data_root by project name, from one directory scan"""
+    return {
+        project_dir.name: load_git_statistics(project_dir)
+        for project_dir in data_root.iterdir()
+        if (project_dir / STATS_FILE).exists()
+    }
+
+
+class ProjectManager:
+    """Tracked projects: registered in data_root/projects.db, their data kept in data_root/<name>"""
+
+    def __init__(self, data_root: str = "../data"):
+        self.data_root = Path(data_root)
+        self.data_root.mkdir(parents=True, exist_ok=True)
+        self.engine = get_engine(self.data_root / REGISTRY_DB)
+        create_tables(self.engine)
+
+    def add_project(self, name: str, repo_path: Path, force: bool = False) -> ProjectDB:
+        """Register the git repository at repo_path as name; force replaces a project of that name"""
+        repo_path = Path(repo_path).expanduser().resolve()
+        if not repo_path.is_dir() or subprocess.run(
+            ["git", "rev-parse", "--git-dir"], cwd=repo_path, capture_output=True
+        ).returncode != 0:
+            raise ValueError(f"Not a git repository: {repo_path}")
+        data_path = self.data_root / name
+        data_path.mkdir(parents=True, exist_ok=True)
+        with Session(self.engine) as session:
+            existing = session.exec(select(ProjectDB).where(ProjectDB.name == name)).first()
+            if existing is not None:
+                if not force:
+                    raise ValueError(f"Project '{name}' already exists, use --force to replace it")
+                session.delete(existing)
+                session.flush()
+            project = ProjectDB(name=name, repo_path=str(repo_path), data_path=str(data_path.resolve()))
+            session.add(project)
+            session.commit()
+            session.refresh(project)
+            return project
+
+    def get_project(self, name: str) -> ProjectDB:
+        with Session(self.engine) as session:
+            project = session.exec(select(ProjectDB).where(ProjectDB.name == name)).first()
+        if project is None:
+            raise ValueError(f"Project '{name}' not found")
+        return project
+
+    def list_projects(self) -> List[ProjectDB]:
+        with Session(self.engine) as session:
+            return list(session.exec(select(ProjectDB).order_by(ProjectDB.name))) # type: ignore
+
+    def remove_project(self, name: str, keep_data: bool = False):
+        project = self.get_project(name)
+        with Session(self.engine) as session:
+            session.delete(session.get(ProjectDB, project.id))
+            session.commit()
+        if not keep_data:
+            shutil.rmtree(project.data_path, ignore_errors=True)
+
+    def fetch_git_logs(self, name: str, force: bool = False) -> dict:
+        """
+        Fetch the git history of a project into its data folder, see fetch_git_logs. Only commits
+        after the last fetched HEAD are read, unless force asks for the whole history again.
+        """
+        project = self.get_project(name)
+        stats = fetch_git_logs(
+            Path(project.repo_path), Path(project.data_path),
+            last_sha=None if force else project.last_ingested_sha,
+        )
+        with Session(self.engine) as session:
+            stored = session.get(ProjectDB, project.id)
+            stored.last_ingested_sha = stats["head"] # type: ignore
+            session.add(stored)
+            session.commit()
+        return stats
+
+    def update_project(self, name: str, fetch_git: bool = True, force: bool = False) -> bool:
+        """Refresh the data of a project; True if HEAD moved since the last fetch, or forced"""
+        if not fetch_git:
+            return False
+        last_sha = self.get_project(name).last_ingested_sha
+        return self.fetch_git_logs(name, force=force)["head"] != last_sha or force
+
+    def get_git_statistics(self, name: str) -> dict:
+        return load_git_statistics(Path(self.get_project(name).data_path))
+
+    def get_all_git_statistics(self) -> Dict[str, dict]:
+        """Git stats of every fetched project by name"""
+        return load_all_git_statistics(self.data_root)
+
+    def extract_repo_metadata(self, name: str) -> dict:
+        """Current branch and origin url of a project repository, None where git has none"""
+        repo_path = Path(self.get_project(name).repo_path)
+
+        def git(*args: str) -> Optional[str]:
+            result = subprocess.run(["git", *args], cwd=repo_path, capture_output=True, text=True)
+            return (result.stdout.strip() or None) if result.returncode == 0 else None
+
+        return {
+            "branch": git("rev-parse", "--abbrev-ref", "HEAD"),
+            "remote_url": git("config", "--get", "remote.origin.url"),
+        }
+
+    def _read_commits(self, name: str, from_date: Optional[date] = None, since: Optional[str] = None) -> List[dict]:
+        """Commits of a project repository, newest first; since (a git --since option) is applied by git"""
+        repo_path = Path(self.get_project(name).repo_path)
+        if from_date:
+            return fetch_commits_until(repo_path, from_date, *([since] if since else []))
+        return list(iter_git_log(repo_path, *([since] if since else [])))
+
+    def analyze_contributors(
+            self,
+            name: str,
+            from_date: Optional[date] = None,
+            since: Optional[str] = None,
+            top_n: Optional[int] = None,
+            detailed: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Per-author stats of the project commits since from_date, top_n authors by commits"""
+        return _contributors(self._read_commits(name, from_date, since))[:top_n]
+
+    def analyze_project(
+            self,
+            name: str,
+            from_date: Optional[date] = None,
+            since: Optional[str] = None,
+            detailed: bool = False
+    ) -> Dict[str, Any]:
+        """Commit and closed task metrics of a project since from_date, from one read of the history"""
+        # Task files are parsed with pandas around; only analysis pays for that import
+        from utils import load_closed_tasks
+
+        project = self.get_project(name)
+        commits = self._read_commits(name, from_date, since)
+        contributors = _contributors(commits)
+
+        tasks_dir = Path(project.data_path) / "closed_tasks"
+        tasks = load_closed_tasks(tasks_dir) if tasks_dir.is_dir() else []
+        if from_date:
+            cutoff = _aware(from_date).timestamp()
+            tasks = [t for t in tasks if t.finished_at is None or t.finished_at >= cutoff]
+        categories: Dict[str, int] = {}
+        for task in tasks:
+            categories[task.category.value] = categories.get(task.category.value, 0) + 1
+
+        daily: Dict[str, Dict[str, Any]] = {}
+        for commit in reversed(commits):  # oldest first, so days come out in order
+            day = daily.setdefault(commit["date"][:10], {
+                "day": commit["date"][:10], "commits": 0, "insertions": 0, "deletions": 0,
+            })
+            day["commits"] += 1
+            day["insertions"] += commit["insertions"]
+            day["deletions"] += commit["deletions"]
+
+        analysis: Dict[str, Any] = {
+            "project_name": name,
+            "period_start": from_date.isoformat() if from_date else (commits[-1]["date"][:10] if commits else None),
+            "period_end": commits[0]["date"][:10] if commits else date.today().isoformat(),
+            "total_commits": len(commits),
+            "total_tasks": len(tasks),
+            "contributors_count": len(contributors),
+            # Closed tasks per day with commits
+            "productivity_score": len(tasks) / len(daily) if daily else 0.0,
+            "task_categories": categories,
+            "daily_stats": list(daily.values()),
+        }
+        if detailed:
+            # Fewest authors that made half of the commits
+            bus_factor = covered = 0
+            for author in contributors:
+                if covered * 2 >= len(commits):
+                    break
+                covered += author["commits"]
+                bus_factor += 1
+            analysis["top_contributors"] = contributors[:10]
+            analysis["code_metrics"] = {
+                "avg_commits_per_day": len(commits) / len(daily) if daily else 0.0,
+                "avg_changes_per_commit": (
+                    sum(c["insertions"] + c["deletions"] for c in commits) / len(commits) if commits else 0.0
+                ),
+                "bus_factor": bus_factor,
+                "active_days": len(daily),
+            }
+        return analysis
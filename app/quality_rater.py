@@ -1,59 +1,96 @@
-from ollama import Client
+import asyncio
+import hashlib
+import re
+import shelve
+from contextlib import nullcontext
+
+from ollama_client import get_client, get_loop
 
 
 class QualityRater:
-    def __init__(self, model_name="gemma3:4b"):
+    # The answer is just the rate: all of gemma's answer, all of deepseek's after its </think> block.
+    # A number inside a sentence ("4 tasks match", "0.5 because") is not taken for one
+    NUMBER = r'[-+]?(?:\d+\.?\d*|\.\d+)'
+    DEEPSEEK_ANSWER = re.compile(rf'</think>\s*({NUMBER})\s*\Z')
+    GEMMA_FLOAT = re.compile(rf'\A\s*({NUMBER})\s*\Z')
+    ANSWER_PATTERNS = {'deepseek': DEEPSEEK_ANSWER, 'gemma': GEMMA_FLOAT}
+
+    def __init__(self, model_name="gemma3:4b", cache_path="quality_rater.cache"):
         self.base_prompt = 'You are Rater of quality reverse git  analysts. Your main task - \
               give right rate of predicted tasks of solved by commits and real life state\
                   \nOutput is just one float number from 0 to 1: where 0 absolutly bullshit from reverse analyst and 1 is full matching'\
                   'No additional information, just one number.'
 
 
-        self.llm_client = Client(
-            host='http://localhost:11434',
-            headers={'x-some-header': 'some-value'}
-        )
+        # Shared loop and client: the rater reuses the connections opened by the analyst
+        self._loop = get_loop()
+        self.llm_client = get_client()
         self.model_name = model_name
+        self._answer_pattern = next(
+            (pattern for family, pattern in self.ANSWER_PATTERNS.items() if model_name.startswith(family)), None
+        )
+        # Rates by digest of model + seed + prompt, kept on disk between runs
+        self.cache_path = cache_path
 
     def _parse_response(self, response) -> float:
-        try:
-            if self.model_name.startswith("deepseek"):
-                _, thinking, answer = response.response.split("think>")
-                print(f"deepthink: {thinking}\nanswer: {answer}")
-                return float(answer)
-            if self.model_name.startswith("gemma"):
-                return float(response.response)
-        except Exception as e:
+        if self._answer_pattern is None:
             return -1.1
+        match = self._answer_pattern.search(response.response)
+        if match is None:
+            return -1.1
+        rate = float(match.group(1))
+        # Rates outside [0, 1] are not answers to the prompt, and would be cached as valid
+        return rate if 0 <= rate <= 1 else -1.1
 
+    async def rate_async(self, llm_predict, original, seed=None, use_cache=True, semaphore=None) -> float:
+        prompt = self.base_prompt + f'predicted tasks {llm_predict}\noriginal tasks:{original}'
+        key = hashlib.sha256(f'{self.model_name}\0{seed}\0{prompt}'.encode()).hexdigest()
+        if use_cache:
+            with shelve.open(self.cache_path) as cache:
+                if key in cache:
+                    return cache[key]
+        async with semaphore or nullcontext():
+            response = await self.llm_client.generate(
+                model=self.model_name, 
+                prompt=prompt,
+                keep_alive='30m',  # same as the analyst, the model stays loaded between rates
+                options={'seed': seed} if seed is not None else None
+            )
+        rate = self._parse_response(response)
+        # Failed parses are retried next time instead of cached
+        if use_cache and rate >= 0:
+            with shelve.open(self.cache_path) as cache:
+                cache[key] = rate
+        return rate
 
+    def rate(self, llm_predict, original, seed=None, use_cache=True) -> float:
+        return self._loop.run_until_complete(self.rate_async(llm_predict, original, seed, use_cache))
 
-    def rate(self, llm_predict, original) -> float:
-        prompt_tail = f'predicted tasks {llm_predict}\noriginal tasks:{original}'
-        response = self.llm_client.generate(
-            model=self.model_name, 
-            prompt=self.base_prompt+prompt_tail
-        )
-        print(response, response.response)
-        return self._parse_response(response)
-    
-    def stable_rate(self, llm_predict, original, attempts=10) -> float:
-        rates = [self.rate(llm_predict, original) for i in range(attempts)]
-        print(rates)
-        rates = [r for r in rates if r>=0]
-        return sum(rates)/len(rates)
+    async def stable_rate_async(self, llm_predict, original, attempts=10, parallel=4) -> float:
+        # A seed per attempt: attempts stay independent samples, and each one is cached on its own
+        semaphore = asyncio.Semaphore(parallel)  # in-flight requests, more only queue up on the GPU
+        rates = await asyncio.gather(*[
+            self.rate_async(llm_predict, original, seed=i, semaphore=semaphore) for i in range(attempts)
+        ])
+        rates = [r for r in rates if r >= 0]
+        # Same failure value as a single unparsed answer when no attempt gave a rate
+        return sum(rates)/len(rates) if rates else -1.1
+
+    def stable_rate(self, llm_predict, original, attempts=10, parallel=4) -> float:
+        return self._loop.run_until_complete(self.stable_rate_async(llm_predict, original, attempts, parallel))
 
 
 
-tasks1 = ['create jinja2 template for .env for new clients I',
-'update docker compose on staging to unclude new containers redis celery etc I',
-'create script to generate client.env file I',
-'fix workers CRUDs B']
+if __name__ == "__main__":
+    tasks1 = ['create jinja2 template for .env for new clients I',
+    'update docker compose on staging to unclude new containers redis celery etc I',
+    'create script to generate client.env file I',
+    'fix workers CRUDs B']
 
-tasks2 = ['create workflow to auto clients app generating I',
-'update docker compose on staging to unclude new containers redis celery etc I',
-'create script to generate client.env file I',
-'fix workers get and read functions B']
+    tasks2 = ['create workflow to auto clients app generating I',
+    'update docker compose on staging to unclude new containers redis celery etc I',
+    'create script to generate client.env file I',
+    'fix workers get and read functions B']
 
-qa = QualityRater("deepseek-r1:8b")
-print(f' Tasks match for {int(qa.stable_rate(tasks1, tasks2) * 100)} %')
\ No newline at end of file
+    qa = QualityRater("deepseek-r1:8b")
+    print(f' Tasks match for {int(qa.stable_rate(tasks1, tasks2) * 100)} %')
@@ -1,50 +1,118 @@
+import hashlib
+import mmap
+import pickle
+import re
 from pathlib import Path
 
 import pandas as pd # type: ignore
 
-from models import ClosedTask, Category
+from models import CATEGORY_BY_VALUE, ClosedTask
 from datetime import datetime
 
+# Parsed closed task files, kept next to the closed_tasks folder
+CLOSED_TASKS_CACHE = ".closed_tasks.cache.pkl"
+# Separator between commit blocks of `git log -p` output; the first block keeps its "commit " prefix
+COMMIT_RE = re.compile(rb'\n\ncommit ')
+# Second word of the Author line, the Date line value and the title (5th line) of a block
+HEADER_RE = re.compile(r'[^\n]*\n\S*[ \t]+(\S+)[^\n]*\n\S*[ \t]*([^\n]*?)[ \t]*\n[^\n]*\n([^\n]*)')
+
+
+def _parse_closed_tasks(file_path: Path, text: str) -> list[ClosedTask]:
+    # Same finish time for every task of a monthly file
+    month = datetime.strptime(file_path.stem.split('_')[0], '%B').month
+    finished_at = int(datetime(datetime.now().year, month, 30, 21, 20, 0).timestamp())
+    return [
+        ClosedTask(text=line[:-3],
+                category=CATEGORY_BY_VALUE[line.strip()[-1]],
+                estimated_time=None,
+                min_skill_level=None,
+                   planned_at=None,
+                   started_at=None,
+                   finished_at=finished_at
+                )
+        for line in text.splitlines(keepends=True)
+        ]
+
+
 def load_closed_tasks(folder_path: Path) -> list[ClosedTask]:
+    """
+    Tasks of every file in folder_path. Parsed files are cached next to the folder by name
+    with their mtime and content hash: a file is re-read only if its mtime changed and
+    re-parsed only if its content did.
+    """
+    cache_path = folder_path.parent / CLOSED_TASKS_CACHE
+    # Finish times depend on the current year, pickled tasks on the ClosedTask fields
+    cache_key = (datetime.now().year, ClosedTask.__match_args__)
+    cache = {}
+    if cache_path.exists():
+        try:
+            with open(cache_path, 'rb') as f:
+                cached_key, cache = pickle.load(f)
+            if cached_key != cache_key:
+                cache = {}
+        except Exception:
+            cache = {}
 
     tasks = []
+    new_cache = {}
     for file_path in folder_path.iterdir():
         # Check if the item is actually a file
         if file_path.is_file():
-            with open(file_path, 'r') as f:
-                tasks += [
-                    ClosedTask(text=line[:-3],
-                            category=Category(line.strip()[-1]),
-                            estimated_time=None,
-                            min_skill_level=None,
-                               planned_at=None,
-                               started_at=None,
-                               finished_at=int(datetime(datetime.now().year, datetime.strptime(file_path.stem.split('_')[0], '%B').month, 30, 21, 20, 0).timestamp())
-                            )
-                    for line in f.readlines()
-                    ]
+            mtime = file_path.stat().st_mtime_ns
+            entry = cache.get(file_path.name)
+            if entry is None or entry[0] != mtime:
+                with open(file_path, 'r') as f:
+                    text = f.read()
+                digest = hashlib.sha256(text.encode()).hexdigest()
+                if entry is None or entry[1] != digest:
+                    entry = (mtime, digest, _parse_closed_tasks(file_path, text))
+                else:
+                    entry = (mtime, digest, entry[2])
+            new_cache[file_path.name] = entry
+            tasks += entry[2]
 
+    if new_cache != cache:
+        with open(cache_path, 'wb') as f:
+            pickle.dump((cache_key, new_cache), f)
     return tasks
 
+def _parse_commits(data):
+    """
+    Yield (text, author, date, title, insertions, deletions) per commit block of the bytes-like
+    data, in one pass each; only the block being parsed is decoded.
+    """
+    start = 0
+    for separator in COMMIT_RE.finditer(data):
+        yield _parse_commit(data[start:separator.start()].decode(errors="replace"))
+        start = separator.end()
+    yield _parse_commit(data[start:].decode(errors="replace"))
+
+
+def _parse_commit(text: str):
+    header = HEADER_RE.match(text)
+    author, date, title = header.groups() if header else (None, None, None)
+    # Diff lines start right after a newline; the first line is always the commit hash
+    return text, author, date, title, text.count("\n+"), text.count("\n-")
+
+
 def load_git_logs(filename="git.logs"):
-    with open(filename, 'r') as f:
-        commit_texts = f.read().split("\n\ncommit ")
-        df = pd.DataFrame([
-            {
-                "text": c,
-                "author": c.split('\n')[1].split()[1],
-                "date": " ".join(c.split('\n')[2].split()[1:]),
-                "title": c.split('\n')[4],
-                "insertions": len([line for line in c.split('\n') if line.startswith("+")]),
-                "deletions": len([line for line in c.split('\n') if line.startswith("-")])
-            } 
-        for c in commit_texts
-        ])
-        df["date"] = pd.to_datetime(df["date"], errors="coerce")
-        df["day"] = df["date"].dt.date
-        df["timestamp"] = df["date"].apply(pd.Timestamp) #type: ignore
-        df = df.set_index("date")
-        return df
+    # Mapped, not read: the page cache holds the file, the heap only one decoded block at a time
+    with open(filename, 'rb') as f:
+        if Path(filename).stat().st_size == 0:  # an empty file cannot be mapped
+            records = list(_parse_commits(b""))
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                records = list(_parse_commits(data))
+    df = pd.DataFrame.from_records(
+        records,
+        columns=["text", "author", "date", "title", "insertions", "deletions"],
+    )
+    df["date"] = pd.to_datetime(df["date"], errors="coerce")
+    df["day"] = df["date"].dt.date
+    # Already datetime64: the column is a copy, not a Timestamp built per row
+    df["timestamp"] = df["date"]
+    df = df.set_index("date")
+    return df
 
 
 # def f():
@@ -0,0 +1,89 @@
+import csv
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import orjson
+from typer.testing import CliRunner
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "app"))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "app" / "core"))
+
+import main  # noqa: E402
+from project_manager import ProjectManager  # noqa: E402
+from test_project_manager import make_repo  # noqa: E402
+
+
+class StatsCommandTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = Path(tmp.name)
+        self.pm = ProjectManager(str(self.tmp / "data"))
+        self.pm.add_project("demo", make_repo(self.tmp / "demo"))
+        self.pm.add_project("small", make_repo(self.tmp / "small", months=range(1, 3)))
+        self.pm.add_project("empty", make_repo(self.tmp / "empty"))
+        self.pm.fetch_git_logs("demo")
+        self.pm.fetch_git_logs("small")
+        patcher = mock.patch.object(main, "_pm", lambda: self.pm)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def invoke(self, *args):
+        result = CliRunner().invoke(main.app, list(args))
+        self.assertEqual(result.exit_code, 0, result.output)
+        return result.output
+
+    def test_stats_of_all_projects(self):
+        output = self.invoke("stats")
+        for name in ("demo", "small", "empty"):
+            self.assertIn(name, output)
+
+    def test_stats_compare_and_export(self):
+        export = self.tmp / "stats.csv"
+        output = self.invoke("stats", "--compare", "--export", str(export))
+        self.assertIn("Projects Comparison", output)
+        # Most commits first
+        self.assertLess(output.index("demo"), output.index("small"))
+        with export.open(newline="") as fh:
+            rows = {row["project"]: row["commits"] for row in csv.DictReader(fh)}
+        self.assertEqual(rows, {"demo": "6", "empty": "0", "small": "2"})
+
+    def test_stats_of_one_project(self):
+        export = self.tmp / "demo.json"
+        output = self.invoke("stats", "demo", "--export", str(export))
+        self.assertIn("Git Statistics", output)
+        stats = orjson.loads(export.read_bytes())
+        self.assertEqual(stats["git_stats"]["total_commits"], 6)
+        self.assertEqual(stats["summary"]["total_commits"], 6)
+        self.assertEqual(stats["daily_stats"][0]["day"], "2025-01-15")
+
+    def test_list_detailed_sorted_by_size(self):
+        output = self.invoke("list", "--detailed", "--sort", "size")
+        self.assertLess(output.index("demo"), output.index("small"))
+        self.assertLess(output.index("small"), output.index("empty"))
+
+    def test_all_projects_stats_do_not_run_git(self):
+        # Every project's stats come from its saved git_stats.json, not from git
+        with mock.patch("subprocess.run", side_effect=AssertionError("git was run")), \
+                mock.patch("subprocess.Popen", side_effect=AssertionError("git was run")):
+            self.invoke("stats", "--compare")
+            self.invoke("list", "--detailed", "--sort", "activity")
+
+    def test_commands_without_their_package_fail_cleanly(self):
+        for args, message in ((["predict", "demo", "--task", "Fix login"], "Error predicting tasks"),
+                              (["report", "demo", "--no-open"], "Error generating report")):
+            result = CliRunner().invoke(main.app, args)
+            self.assertEqual(result.exit_code, 1)
+            self.assertNotIsInstance(result.exception, ModuleNotFoundError)
+            self.assertIn(message, result.output)
+
+    def test_list_rejects_unknown_sort(self):
+        result = CliRunner().invoke(main.app, ["list", "--sort", "stars"])
+        self.assertEqual(result.exit_code, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "app"))
+
+from core.context_keeper import PMContext  # noqa: E402
+from project_manager import ProjectManager  # noqa: E402
+
+
+class StoredCommitsTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        repo = Path(tmp.name) / "repo"
+        repo.mkdir()
+        subprocess.run(["git", "init", "-q", "-b", "main"], cwd=repo, check=True)
+        # Late evening for the author, already the next day in UTC
+        for n, moment in enumerate(["2025-03-15T22:00:00-05:00", "2025-03-20T10:00:00-05:00"]):
+            (repo / "f.txt").write_text(f"line {n}\n")
+            subprocess.run(["git", "add", "f.txt"], cwd=repo, check=True)
+            subprocess.run(
+                ["git", "-c", "user.name=Ann Lee", "-c", "user.email=ann@example.com",
+                 "commit", "-q", "-m", f"change {n}"],
+                cwd=repo, check=True,
+                env={**os.environ, "GIT_AUTHOR_DATE": moment, "GIT_COMMITTER_DATE": moment},
+            )
+        self.pm = ProjectManager(str(Path(tmp.name) / "data"))
+        self.pm.add_project("demo", repo)
+        self.pm.fetch_git_logs("demo")
+        self.context = PMContext(str(Path(tmp.name) / "data"), "demo")
+
+    def test_days_are_the_author_local_date(self):
+        days = [d["day"] for d in self.pm.analyze_project("demo")["daily_stats"]]
+        self.assertEqual(days, ["2025-03-15", "2025-03-20"])
+        self.assertEqual(list(self.context.daily_stats["day"]), [date(2025, 3, 15), date(2025, 3, 20)])
+
+    def test_contributor_seen_at_commit_dates(self):
+        from sqlmodel import Session, select
+        from core.db import ContributorDB
+
+        with Session(self.context.engine) as session:
+            contributor = session.exec(select(ContributorDB)).one()
+        self.assertEqual(contributor.first_seen.date(), date(2025, 3, 16))  # UTC
+        self.assertEqual(contributor.last_seen.date(), date(2025, 3, 20))
+
+
+if __name__ == "__main__":
+    unittest.main()
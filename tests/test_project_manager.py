@@ -0,0 +1,72 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from datetime import date
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "app"))
+
+import project_manager  # noqa: E402
+from project_manager import ProjectManager  # noqa: E402
+
+
+def make_repo(path: Path, months=range(1, 7)) -> Path:
+    """Git repository with one commit on the 15th of each month of 2025"""
+    path.mkdir(parents=True)
+    subprocess.run(["git", "init", "-q", "-b", "main"], cwd=path, check=True)
+    for month in months:
+        with open(path / "f.txt", "a") as f:
+            f.write(f"line {month}\n")
+        moment = f"2025-{month:02d}-15T12:00:00+00:00"
+        subprocess.run(["git", "add", "f.txt"], cwd=path, check=True)
+        subprocess.run(
+            ["git", "-c", "user.name=Ann Lee", "-c", "user.email=ann@example.com",
+             "commit", "-q", "-m", f"change {month}"],
+            cwd=path, check=True,
+            env={**os.environ, "GIT_AUTHOR_DATE": moment, "GIT_COMMITTER_DATE": moment},
+        )
+    return path
+
+
+class AnalyzePeriodTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.repo = make_repo(Path(tmp.name) / "repo")
+        self.pm = ProjectManager(str(Path(tmp.name) / "data"))
+        self.pm.add_project("demo", self.repo)
+
+    def count_read_commits(self, **kwargs):
+        """Commits git log handed to the reader during analyze_project"""
+        read = []
+        original = project_manager.iter_git_log
+
+        def counting(*args):
+            for commit in original(*args):
+                read.append(commit)
+                yield commit
+
+        with mock.patch.object(project_manager, "iter_git_log", counting):
+            analysis = self.pm.analyze_project("demo", **kwargs)
+        return analysis, len(read)
+
+    def test_since_is_applied_by_git(self):
+        from_date = date(2025, 4, 1)
+        without_since, read_all = self.count_read_commits(from_date=from_date)
+        with_since, read_since = self.count_read_commits(from_date=from_date, since="--since=2025-04-01")
+
+        self.assertEqual(read_all, 6)
+        self.assertEqual(read_since, 3)
+        self.assertEqual(with_since["total_commits"], 3)
+        self.assertEqual(without_since["total_commits"], 3)
+
+    def test_contributors_of_period(self):
+        contributors = self.pm.analyze_contributors("demo", from_date=date(2025, 5, 1), since="--since=2025-05-01")
+        self.assertEqual([(c["author"], c["commits"], c["active_days"]) for c in contributors], [("Ann Lee", 2, 2)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,31 @@
+import sys
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "app"))
+
+from quality_rater import QualityRater  # noqa: E402
+
+
+class ParseResponseTest(unittest.TestCase):
+    def parse(self, model_name, answer):
+        return QualityRater(model_name)._parse_response(SimpleNamespace(response=answer))
+
+    def test_bare_rates(self):
+        for model_name, answer in (("gemma3:4b", " 0.75\n"), ("deepseek-r1:8b", "<think>4 tasks</think>\n0.75")):
+            self.assertEqual(self.parse(model_name, answer), 0.75)
+        self.assertEqual(self.parse("gemma3:4b", "1."), 1.0)
+        self.assertEqual(self.parse("deepseek-r1:8b", "<think></think> 1."), 1.0)
+
+    def test_rates_in_sentences_are_rejected(self):
+        self.assertEqual(self.parse("gemma3:4b", "4 tasks match, 0.5"), -1.1)
+        self.assertEqual(self.parse("deepseek-r1:8b", "<think></think>0.5 because two tasks match"), -1.1)
+
+    def test_rates_outside_the_range_are_rejected(self):
+        self.assertEqual(self.parse("gemma3:4b", "1.5"), -1.1)
+        self.assertEqual(self.parse("deepseek-r1:8b", "<think></think>7"), -1.1)
+
+
+if __name__ == "__main__":
+    unittest.main()